@@ -411,7 +411,7 @@ class TextProcessor:
             
             # 检查网络连接
             from ..utils.api_utils import APIUtils
-            if not APIUtils.is_network_available():
+            if not APIUtils.is_network_available(self.client.base_url):
                 issues.append("网络连接不可用")
             
             # 检查模板加载
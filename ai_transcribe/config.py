@@ -45,7 +45,8 @@ class Config:
             'cache': {
                 'enabled': True,
                 'max_size_mb': 500,
-                'ttl_hours': 24
+                'ttl_hours': 24,
+                'memory_max_items': 128
             },
             'prompts': {
                 'builtin': self._get_default_prompts(),
@@ -135,10 +135,9 @@ class AITranscribeApp:
                     success, files, error = self.share_handler.handle_appex_files()
                     
                     if success and files:
-                        for file_path in files:
-                            self.main_view.add_file(file_path)
+                        added_count = self.main_view.add_files(files)
                         
-                        logger.info(f"从分享扩展添加了 {len(files)} 个文件")
+                        logger.info(f"从分享扩展添加了 {added_count} 个文件")
                     elif error:
                         logger.warning(f"处理分享扩展失败: {error}")
         
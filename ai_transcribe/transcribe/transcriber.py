@@ -292,7 +292,7 @@ class Transcriber:
             
             # 检查网络连接
             from ..utils.api_utils import APIUtils
-            if not APIUtils.is_network_available():
+            if not APIUtils.is_network_available(self.client.base_url):
                 issues.append("网络连接不可用")
             
             # 检查缓存目录
@@ -5,13 +5,68 @@
 """
 
 import ui
+import console
 import os
+import threading
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any
 from ..utils.logger import get_logger
-from ..config import config
+from ..utils.file_utils import FileUtils
+from ..ios_integration.share_extension import ShareExtensionHandler
+
+try:
+    from objc_util import on_main_thread
+except ImportError:
+    # 不在iOS环境中，直接调用
+    def on_main_thread(func):
+        return func
 
 logger = get_logger(__name__)
 
+# 添加文件帮助信息
+_ADD_FILE_HELP = '''
+请通过以下方式添加文件：
+1. 使用"分享"按钮从其他应用分享文件
+2. 通过URL Scheme调用: ai-transcribe://open?file=...
+3. 将文件保存到Pythonista的Documents目录
+
+支持的格式：
+音频: .mp3, .wav, .aac, .m4a, .flac
+视频: .mp4, .mov, .avi, .mkv, .wmv
+'''
+
+# 模板选择器各分段对应的模板ID
+_TEMPLATE_IDS = ('meeting_notes', 'study_notes', 'content_summary', 'custom_cleanup')
+
+def _template_for_index(index: int) -> str:
+    """根据模板选择器索引获取模板ID"""
+    return _TEMPLATE_IDS[index] if 0 <= index < len(_TEMPLATE_IDS) else 'custom_cleanup'
+
+# 屏幕尺寸缓存，由MainView._get_screen_size填充
+_SCREEN_SIZE_CACHE = None
+
+# 自动扫描的Documents目录
+_DOCUMENTS_PATH = os.path.expanduser('~/Documents')
+
+class FileEntry:
+    """文件列表条目
+    
+    保留下标访问（file_info['path']），兼容按字典读取条目的调用方。
+    """
+    
+    __slots__ = ('path', 'name', 'size_mb', 'type', 'subtitle')
+    
+    def __init__(self, path: str, name: str, size_mb: float, type: str):
+        self.path = path
+        self.name = name
+        self.size_mb = size_mb
+        self.type = type
+        # 单元格副标题在添加时生成，避免滚动时重复格式化
+        self.subtitle = f"{size_mb:.1f}MB • {type}"
+    
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
 class MainView:
     """主界面类"""
     
@@ -19,7 +74,9 @@ class MainView:
         self.app_controller = app_controller
         self.view = None
         self.file_list = []
-        self.selected_files = []
+        self._file_paths = set()  # 与file_list同步，用于O(1)去重
+        self.selected_indices = set()  # 选中行的索引
+        self._last_status = None
         
         # UI组件引用
         self.file_table = None
@@ -32,34 +89,36 @@ class MainView:
         self._create_ui()
     
     def _get_screen_size(self):
-        """获取屏幕尺寸"""
+        """获取屏幕尺寸（首次获取后缓存）"""
+        global _SCREEN_SIZE_CACHE
+        if _SCREEN_SIZE_CACHE is not None:
+            return _SCREEN_SIZE_CACHE
+        
         try:
-            # 尝试获取实际屏幕尺寸
-            import console
-            if hasattr(console, 'get_window_size'):
-                console_size = console.get_window_size()
-                # console返回的是字符尺寸，需要估算像素尺寸
-                width = max(375, console_size[0] * 10)  # 假设每字符10px宽
-                height = max(667, console_size[1] * 20)  # 假设每字符20px高
-            else:
-                # 默认iPhone尺寸
-                width, height = 375, 667
-            
-            # 如果可用，尝试从ui模块获取更准确的尺寸
+            # 优先使用ui模块提供的屏幕尺寸
+            width, height = 0, 0
             try:
-                temp_view = ui.View()
-                temp_view.present('fullscreen', hide_title_bar=True)
-                if temp_view.width > 0 and temp_view.height > 0:
-                    width, height = temp_view.width, temp_view.height
-                temp_view.close()
-            except:
+                width, height = ui.get_screen_size()
+            except Exception:
                 pass
-                
-            logger.debug(f"屏幕尺寸: {width}x{height}")
-            return width, height
+            
+            if width <= 0 or height <= 0:
+                # 回退到console窗口尺寸估算
+                if hasattr(console, 'get_window_size'):
+                    console_size = console.get_window_size()
+                    # console返回的是字符尺寸，需要估算像素尺寸
+                    width = max(375, console_size[0] * 10)  # 假设每字符10px宽
+                    height = max(667, console_size[1] * 20)  # 假设每字符20px高
+                else:
+                    # 默认iPhone尺寸
+                    width, height = 375, 667
+            
+            logger.debug("屏幕尺寸: %sx%s", width, height)
+            _SCREEN_SIZE_CACHE = (width, height)
+            return _SCREEN_SIZE_CACHE
             
         except Exception as e:
-            logger.warning(f"获取屏幕尺寸失败，使用默认值: {e}")
+            logger.warning("获取屏幕尺寸失败，使用默认值: %s", e)
             # iPhone 6/7/8 尺寸作为默认值
             return 375, 667
     
@@ -68,6 +127,8 @@ class MainView:
         try:
             # 获取动态尺寸
             self.screen_width, self.screen_height = self._get_screen_size()
+            self._metrics = self._compute_metrics(self.screen_width, self.screen_height)
+            self._layout = self._layout_plan()
             
             # 主视图
             self.view = ui.View(name='AI音视频转文字工具')
@@ -75,17 +136,21 @@ class MainView:
             # 让主视图使用全屏
             self.view.frame = (0, 0, self.screen_width, self.screen_height)
             
+            subviews = []
+            
             # 标题栏
-            self._create_title_bar()
+            subviews += self._create_title_bar()
             
             # 文件区域
-            self._create_file_area()
+            subviews += self._create_file_area()
             
-            # 控制区域
-            self._create_control_area()
+            # 控制区域和状态栏在首次显示后再创建，见_create_deferred_ui
             
-            # 状态栏
-            self._create_status_bar()
+            # 统一添加子视图，避免逐个添加时反复触发布局
+            self.view.hidden = True
+            for subview in subviews:
+                self.view.add_subview(subview)
+            self.view.hidden = False
             
             logger.info("主界面创建完成")
         
@@ -93,203 +158,269 @@ class MainView:
             logger.exception("创建主界面异常")
             raise
     
-    def _create_title_bar(self):
+    def _create_deferred_ui(self):
+        """创建控制区域和状态栏（首次显示后执行，缩短启动时间）"""
+        try:
+            if self.transcribe_button is not None:
+                return
+            
+            # 显示后主视图已是实际尺寸，按实际尺寸重新计算布局，并同步已创建的控件
+            width, height = self.view.width, self.view.height
+            if width > 0 and height > 0 and (width, height) != (self.screen_width, self.screen_height):
+                self._layout = self._layout_plan(width, height)
+                for subview in self.view.subviews:
+                    frame = self._layout.get(subview.name)
+                    if frame is not None:
+                        subview.frame = frame
+            
+            subviews = self._create_control_area() + self._create_status_bar()
+            for subview in subviews:
+                self.view.add_subview(subview)
+        
+        except Exception:
+            logger.exception("创建控制区域异常")
+    
+    @staticmethod
+    def _compute_metrics(width, height) -> Dict[str, int]:
+        """根据屏幕尺寸一次性计算字体大小和控件尺寸"""
+        settings_size = max(30, int(width / 12))
+        return {
+            'margin': 20,
+            'font_title': max(16, int(width / 20)),
+            'font_header': max(14, int(width / 24)),
+            'font_md': max(14, int(width / 26)),
+            'font_sm': max(12, int(width / 30)),
+            'title_h': max(40, int(height * 0.06)),
+            'btn_h': max(45, int(height * 0.06)),
+            'btn_sm_h': max(35, int(height * 0.05)),
+            'settings_size': settings_size,
+            'settings_font': max(18, int(settings_size * 0.7)),
+        }
+    
+    def _layout_plan(self, width=None, height=None) -> Dict[str, tuple]:
+        """一次性计算所有控件的frame（默认按屏幕尺寸），各_create_*方法从中读取"""
+        if width is None:
+            width, height = self.screen_width, self.screen_height
+        metrics = self._metrics
+        margin = metrics['margin']
+        content_width = width - 2*margin
+        plan = {}
+        
+        # 标题栏
+        title_height = metrics['title_h']
+        button_size = metrics['settings_size']
+        plan['title_label'] = (0, margin, width, title_height)
+        plan['settings_button'] = (width - button_size - margin,
+                                   margin + (title_height - button_size) // 2,
+                                   button_size, button_size)
+        
+        # 文件区域
+        current_y = margin + title_height + 20
+        plan['file_title'] = (margin, current_y, content_width, 30)
+        
+        current_y += 40
+        button_height = metrics['btn_sm_h']
+        button_width = int((width - 4*margin) / 3)  # 3 buttons with margins
+        plan['add_file_button'] = (margin, current_y, button_width, button_height)
+        plan['clear_button'] = (margin + button_width + margin, current_y, button_width*0.6, button_height)
+        plan['share_button'] = (width - margin - button_width, current_y, button_width, button_height)
+        
+        current_y += button_height + 20
+        table_height = int(height * 0.3)  # 30% of screen height
+        plan['file_table'] = (margin, current_y, content_width, table_height)
+        
+        # 控制区域
+        current_y += table_height + 20
+        plan['template_title'] = (margin, current_y, 150, 30)
+        
+        current_y += 40
+        plan['template_selector'] = (margin, current_y, content_width, 30)
+        
+        current_y += 50
+        button_height = metrics['btn_h']
+        button_width = int((width - 3*margin) / 2)  # 2 buttons side by side
+        plan['transcribe_button'] = (margin, current_y, button_width, button_height)
+        plan['process_button'] = (margin + button_width + margin, current_y, button_width, button_height)
+        
+        current_y += button_height + 15
+        plan['one_click_button'] = (margin, current_y, content_width, button_height)
+        
+        # 状态栏
+        current_y += button_height + 20
+        plan['status_label'] = (margin, current_y, content_width, 20)
+        
+        return plan
+    
+    def _create_title_bar(self) -> List[ui.View]:
         """创建标题栏"""
-        margin = 20
-        title_height = max(40, int(self.screen_height * 0.06))
+        subviews = []
+        metrics = self._metrics
+        layout = self._layout
         
         # 标题标签
         title_label = ui.Label(name='title_label')
         title_label.text = 'AI音视频转文字工具'
-        title_label.font = ('<system-bold>', max(16, int(self.screen_width / 20)))
+        title_label.font = ('<system-bold>', metrics['font_title'])
         title_label.text_color = '#333333'
         title_label.alignment = ui.ALIGN_CENTER
-        title_label.frame = (0, margin, self.screen_width, title_height)
+        title_label.frame = layout['title_label']
         title_label.flex = 'W'
-        self.view.add_subview(title_label)
+        subviews.append(title_label)
         
         # 设置按钮
-        button_size = max(30, int(self.screen_width / 12))
         self.settings_button = ui.Button(name='settings_button')
         self.settings_button.title = '⚙️'
-        self.settings_button.font = ('<system>', max(18, int(button_size * 0.7)))
-        self.settings_button.frame = (self.screen_width - button_size - margin, 
-                                    margin + (title_height - button_size) // 2, 
-                                    button_size, button_size)
+        self.settings_button.font = ('<system>', metrics['settings_font'])
+        self.settings_button.frame = layout['settings_button']
         self.settings_button.flex = 'L'
         self.settings_button.action = self._settings_action
-        self.view.add_subview(self.settings_button)
+        subviews.append(self.settings_button)
+        
+        return subviews
     
-    def _create_file_area(self):
+    def _create_file_area(self) -> List[ui.View]:
         """创建文件区域"""
-        margin = 20
-        title_bar_height = max(40, int(self.screen_height * 0.06)) + 20  # title + margin
-        current_y = title_bar_height + 20
+        subviews = []
+        metrics = self._metrics
+        layout = self._layout
         
         # 文件区域标题
         file_title = ui.Label(name='file_title')
         file_title.text = '选择音视频文件'
-        file_title.font = ('<system-bold>', max(14, int(self.screen_width / 24)))
+        file_title.font = ('<system-bold>', metrics['font_header'])
         file_title.text_color = '#666666'
-        file_title.frame = (margin, current_y, self.screen_width - 2*margin, 30)
+        file_title.frame = layout['file_title']
         file_title.flex = 'W'
-        self.view.add_subview(file_title)
-        
-        current_y += 40
-        button_height = max(35, int(self.screen_height * 0.05))
-        button_width = int((self.screen_width - 4*margin) / 3)  # 3 buttons with margins
+        subviews.append(file_title)
         
         # 添加文件按钮
         add_file_button = ui.Button(name='add_file_button')
         add_file_button.title = '+ 添加文件'
-        add_file_button.font = ('<system>', max(14, int(self.screen_width / 26)))
+        add_file_button.font = ('<system>', metrics['font_md'])
         add_file_button.background_color = '#007AFF'
         add_file_button.tint_color = 'white'
         add_file_button.corner_radius = 8
-        add_file_button.frame = (margin, current_y, button_width, button_height)
+        add_file_button.frame = layout['add_file_button']
         add_file_button.action = self._add_file_action
-        self.view.add_subview(add_file_button)
+        subviews.append(add_file_button)
         
         # 清空列表按钮
         clear_button = ui.Button(name='clear_button')
         clear_button.title = '清空'
-        clear_button.font = ('<system>', max(14, int(self.screen_width / 26)))
+        clear_button.font = ('<system>', metrics['font_md'])
         clear_button.background_color = '#FF3B30'
         clear_button.tint_color = 'white'
         clear_button.corner_radius = 8
-        clear_button.frame = (margin + button_width + margin, current_y, button_width*0.6, button_height)
+        clear_button.frame = layout['clear_button']
         clear_button.action = self._clear_files_action
-        self.view.add_subview(clear_button)
+        subviews.append(clear_button)
         
         # 从分享扩展添加按钮
         share_button = ui.Button(name='share_button')
         share_button.title = '📤 分享'
-        share_button.font = ('<system>', max(14, int(self.screen_width / 26)))
+        share_button.font = ('<system>', metrics['font_md'])
         share_button.background_color = '#34C759'
         share_button.tint_color = 'white'
         share_button.corner_radius = 8
-        share_button.frame = (self.screen_width - margin - button_width, current_y, button_width, button_height)
+        share_button.frame = layout['share_button']
         share_button.action = self._handle_share_action
-        self.view.add_subview(share_button)
-        
-        current_y += button_height + 20
+        subviews.append(share_button)
         
         # 文件列表 - 使用更多空间
-        table_height = int(self.screen_height * 0.3)  # 30% of screen height
         self.file_table = ui.TableView(name='file_table')
-        self.file_table.frame = (margin, current_y, self.screen_width - 2*margin, table_height)
+        self.file_table.frame = layout['file_table']
         self.file_table.flex = 'WH'
+        # 单元格高度统一，固定行高可省去逐行测量
+        self.file_table.row_height = 60
         self.file_table.data_source = FileTableDataSource(self)
         self.file_table.delegate = FileTableDelegate(self)
-        self.view.add_subview(self.file_table)
+        subviews.append(self.file_table)
         
-        # 保存当前Y位置供后续组件使用
-        self._file_area_bottom = current_y + table_height
+        return subviews
     
-    def _create_control_area(self):
+    def _create_control_area(self) -> List[ui.View]:
         """创建控制区域"""
-        margin = 20
-        current_y = self._file_area_bottom + 20
+        subviews = []
+        metrics = self._metrics
+        layout = self._layout
         
         # 模板选择区域
         template_title = ui.Label(name='template_title')
         template_title.text = '处理模板'
-        template_title.font = ('<system-bold>', max(14, int(self.screen_width / 24)))
+        template_title.font = ('<system-bold>', metrics['font_header'])
         template_title.text_color = '#666666'
-        template_title.frame = (margin, current_y, 150, 30)
+        template_title.frame = layout['template_title']
         template_title.flex = 'WT'
-        self.view.add_subview(template_title)
-        
-        current_y += 40
+        subviews.append(template_title)
         
         # 模板选择器
         self.template_selector = ui.SegmentedControl(name='template_selector')
         self.template_selector.segments = ['会议纪要', '学习笔记', '内容摘要', '自定义']
         self.template_selector.selected_index = 0
-        self.template_selector.frame = (margin, current_y, self.screen_width - 2*margin, 30)
+        self.template_selector.frame = layout['template_selector']
         self.template_selector.flex = 'WT'
         self.template_selector.action = self._template_changed
-        self.view.add_subview(self.template_selector)
-        
-        current_y += 50
-        
-        # 操作按钮区域
-        button_height = max(45, int(self.screen_height * 0.06))
-        button_width = int((self.screen_width - 3*margin) / 2)  # 2 buttons side by side
+        subviews.append(self.template_selector)
         
         # 转录按钮
         self.transcribe_button = ui.Button(name='transcribe_button')
         self.transcribe_button.title = '🎤 开始转录'
-        self.transcribe_button.font = ('<system-bold>', max(14, int(self.screen_width / 26)))
+        self.transcribe_button.font = ('<system-bold>', metrics['font_md'])
         self.transcribe_button.background_color = '#007AFF'
         self.transcribe_button.tint_color = 'white'
         self.transcribe_button.corner_radius = 8
-        self.transcribe_button.frame = (margin, current_y, button_width, button_height)
+        self.transcribe_button.frame = layout['transcribe_button']
         self.transcribe_button.flex = 'WT'
         self.transcribe_button.action = self._transcribe_action
-        self.view.add_subview(self.transcribe_button)
+        subviews.append(self.transcribe_button)
         
         # AI处理按钮
         self.process_button = ui.Button(name='process_button')
         self.process_button.title = '🤖 AI整理'
-        self.process_button.font = ('<system-bold>', max(14, int(self.screen_width / 26)))
+        self.process_button.font = ('<system-bold>', metrics['font_md'])
         self.process_button.background_color = '#34C759'
         self.process_button.tint_color = 'white'
         self.process_button.corner_radius = 8
-        self.process_button.frame = (margin + button_width + margin, current_y, button_width, button_height)
+        self.process_button.frame = layout['process_button']
         self.process_button.flex = 'WT'
         self.process_button.action = self._process_action
-        self.view.add_subview(self.process_button)
-        
-        current_y += button_height + 15
+        subviews.append(self.process_button)
         
         # 一键处理按钮
         one_click_button = ui.Button(name='one_click_button')
         one_click_button.title = '⚡ 一键处理'
-        one_click_button.font = ('<system-bold>', max(14, int(self.screen_width / 26)))
+        one_click_button.font = ('<system-bold>', metrics['font_md'])
         one_click_button.background_color = '#FF9500'
         one_click_button.tint_color = 'white'
         one_click_button.corner_radius = 8
-        one_click_button.frame = (margin, current_y, self.screen_width - 2*margin, button_height)
+        one_click_button.frame = layout['one_click_button']
         one_click_button.flex = 'WT'
         one_click_button.action = self._one_click_action
-        self.view.add_subview(one_click_button)
+        subviews.append(one_click_button)
         
-        # 保存当前Y位置供状态栏使用
-        self._control_area_bottom = current_y + button_height
+        return subviews
     
-    def _create_status_bar(self):
+    def _create_status_bar(self) -> List[ui.View]:
         """创建状态栏"""
-        margin = 20
-        current_y = self._control_area_bottom + 20
+        subviews = []
         
         self.status_label = ui.Label(name='status_label')
-        self.status_label.text = '准备就绪'
-        self.status_label.font = ('<system>', max(12, int(self.screen_width / 30)))
+        self.status_label.text = self._last_status or '准备就绪'
+        self.status_label.font = ('<system>', self._metrics['font_sm'])
         self.status_label.text_color = '#666666'
         self.status_label.alignment = ui.ALIGN_CENTER
-        self.status_label.frame = (margin, current_y, self.screen_width - 2*margin, 20)
+        self.status_label.frame = self._layout['status_label']
         self.status_label.flex = 'WT'
-        self.view.add_subview(self.status_label)
+        subviews.append(self.status_label)
+        
+        return subviews
     
     def _add_file_action(self, sender):
         """添加文件操作"""
         try:
             # 在iOS中，通常通过文档选择器选择文件
-            # 这里模拟文件选择过程
-            console_msg = '''
-请通过以下方式添加文件：
-1. 使用"分享"按钮从其他应用分享文件
-2. 通过URL Scheme调用: ai-transcribe://open?file=...
-3. 将文件保存到Pythonista的Documents目录
-
-支持的格式：
-音频: .mp3, .wav, .aac, .m4a, .flac
-视频: .mp4, .mov, .avi, .mkv, .wmv
-            '''
-            
-            # 显示帮助信息
-            self._show_alert('添加文件', console_msg)
+            # 这里模拟文件选择过程，显示帮助信息
+            self._show_alert('添加文件', _ADD_FILE_HELP)
             
             # 尝试检查Documents目录中的文件
             self._scan_documents_folder()
@@ -299,47 +430,81 @@ class MainView:
             self._show_alert('错误', f'添加文件失败: {str(e)}')
     
     def _scan_documents_folder(self):
-        """扫描Documents文件夹中的音视频文件"""
-        try:
-            documents_path = os.path.expanduser('~/Documents')
-            if not os.path.exists(documents_path):
-                return
-            
-            supported_extensions = set()
-            supported_extensions.update(config.get('supported_formats.audio', []))
-            supported_extensions.update(config.get('supported_formats.video', []))
-            
-            found_files = []
-            for filename in os.listdir(documents_path):
-                file_path = os.path.join(documents_path, filename)
-                if os.path.isfile(file_path):
-                    _, ext = os.path.splitext(filename)
-                    if ext.lower() in supported_extensions:
-                        found_files.append(file_path)
-            
-            if found_files:
-                # 自动添加找到的文件
-                for file_path in found_files[:5]:  # 限制数量
-                    if file_path not in [f['path'] for f in self.file_list]:
-                        self.add_file(file_path)
+        """扫描Documents文件夹中的音视频文件（后台线程执行）"""
+        self.update_status('正在扫描Documents文件夹...')
+        threading.Thread(target=self._scan_worker_and_commit, daemon=True).start()
+    
+    def _scan_worker(self) -> List[FileEntry]:
+        """遍历并验证Documents文件夹中的音视频文件，返回尚未加入列表的有效条目"""
+        documents_path = _DOCUMENTS_PATH
+        if not os.path.exists(documents_path):
+            return []
+        
+        existing_paths = self._file_paths
+        # 与validate_file_details使用同一份扩展名配置
+        ext_tuple = FileUtils.supported_extensions()
+        found_entries = []
+        with os.scandir(documents_path) as entries:
+            for entry in entries:
+                # 先按扩展名过滤，DirEntry自带目录读取时的类型信息，无需额外stat
+                if not entry.name.lower().endswith(ext_tuple):
+                    continue
+                if entry.path in existing_paths or not entry.is_file():
+                    continue
                 
-                self.update_status(f'自动发现并添加了 {len(found_files)} 个文件')
+                is_valid, message, file_type, size_mb = FileUtils.validate_file_details(entry.path)
+                if not is_valid:
+                    logger.warning("跳过无效文件 %s: %s", entry.path, message)
+                    continue
+                
+                found_entries.append(FileEntry(entry.path, entry.name, size_mb, file_type))
+                if len(found_entries) >= 5:  # 限制数量
+                    break
         
+        return found_entries
+    
+    def _scan_worker_and_commit(self):
+        """后台扫描，完成后在主线程中提交结果"""
+        try:
+            found_entries = self._scan_worker()
         except Exception as e:
-            logger.warning(f"扫描Documents文件夹失败: {e}")
+            logger.warning("扫描Documents文件夹失败: %s", e)
+            on_main_thread(self.update_status)(f'扫描Documents文件夹失败: {e}')
+            return
+        
+        if found_entries:
+            on_main_thread(self._commit_additions)(found_entries)
+        else:
+            on_main_thread(self.update_status)('Documents文件夹中没有新的音视频文件')
+    
+    def _commit_additions(self, file_entries: List[FileEntry]):
+        """在主线程中批量添加已验证的文件条目"""
+        start = len(self.file_list)
+        for file_info in file_entries:
+            self._append_entry(file_info)
+        
+        added_count = len(self.file_list) - start
+        if added_count:
+            self._insert_rows(start)
+            self.update_status(f'自动发现并添加了 {added_count} 个文件')
+        else:
+            self.update_status('Documents文件夹中没有新的音视频文件')
     
     def _clear_files_action(self, sender):
         """清空文件列表操作"""
+        if not self.file_list and not self.selected_indices:
+            return
+        
         self.file_list.clear()
-        self.selected_files.clear()
+        self._file_paths.clear()
+        self.selected_indices.clear()
+        self.file_table.data_source.invalidate()
         self.file_table.reload()
         self.update_status('文件列表已清空')
     
     def _handle_share_action(self, sender):
         """处理分享扩展操作"""
         try:
-            from ..ios_integration.share_extension import ShareExtensionHandler
-            
             share_handler = ShareExtensionHandler()
             
             # 检查是否在分享扩展环境中
@@ -347,9 +512,8 @@ class MainView:
                 success, files, error = share_handler.handle_appex_files()
                 
                 if success and files:
-                    for file_path in files:
-                        self.add_file(file_path)
-                    self.update_status(f'从分享扩展添加了 {len(files)} 个文件')
+                    added_count = self.add_files(files)
+                    self.update_status(f'从分享扩展添加了 {added_count} 个文件')
                 else:
                     self._show_alert('分享扩展', error or '没有找到分享的文件')
             else:
@@ -362,15 +526,20 @@ class MainView:
     def _template_changed(self, sender):
         """模板选择改变"""
         selected_index = sender.selected_index
-        templates = ['meeting_notes', 'study_notes', 'content_summary', 'custom_cleanup']
         
-        if selected_index < len(templates):
-            template_id = templates[selected_index]
+        if selected_index < len(_TEMPLATE_IDS):
+            template_id = _TEMPLATE_IDS[selected_index]
             self.update_status(f'已选择模板: {sender.segments[selected_index]}')
-            logger.info(f"选择模板: {template_id}")
+            logger.info("选择模板: %s", template_id)
         else:
             self.update_status('已选择自定义模板')
     
+    def _files_to_process(self) -> List[FileEntry]:
+        """获取待处理文件：选中的文件，没有选中时使用第一个文件"""
+        if self.selected_indices:
+            return [self.file_list[i] for i in sorted(self.selected_indices)]
+        return self.file_list[:1]
+    
     def _transcribe_action(self, sender):
         """转录操作"""
         try:
@@ -379,7 +548,7 @@ class MainView:
                 return
             
             # 获取选中的文件，如果没有选中则使用第一个
-            files_to_process = self.selected_files if self.selected_files else [self.file_list[0]]
+            files_to_process = self._files_to_process()
             
             # 启动转录流程
             self.app_controller.start_transcription(files_to_process)
@@ -392,10 +561,7 @@ class MainView:
         """AI处理操作"""
         try:
             # 获取当前选择的模板
-            template_index = self.template_selector.selected_index
-            templates = ['meeting_notes', 'study_notes', 'content_summary', 'custom_cleanup']
-            
-            template_id = templates[template_index] if template_index < len(templates) else 'custom_cleanup'
+            template_id = _template_for_index(self.template_selector.selected_index)
             
             # 启动AI处理流程
             self.app_controller.start_ai_processing(template_id)
@@ -412,12 +578,10 @@ class MainView:
                 return
             
             # 获取选中的文件，如果没有选中则使用第一个
-            files_to_process = self.selected_files if self.selected_files else [self.file_list[0]]
+            files_to_process = self._files_to_process()
             
             # 获取当前选择的模板
-            template_index = self.template_selector.selected_index
-            templates = ['meeting_notes', 'study_notes', 'content_summary', 'custom_cleanup']
-            template_id = templates[template_index] if template_index < len(templates) else 'custom_cleanup'
+            template_id = _template_for_index(self.template_selector.selected_index)
             
             # 启动完整处理流程
             self.app_controller.start_complete_processing(files_to_process, template_id)
@@ -434,73 +598,121 @@ class MainView:
             logger.exception("打开设置异常")
             self._show_alert('错误', f'打开设置失败: {str(e)}')
     
+    def _append_file_info(self, file_path: str) -> Optional[FileEntry]:
+        """验证文件并追加到列表（不刷新表格），返回新条目"""
+        # 验证文件
+        is_valid, message, file_type, size_mb = FileUtils.validate_file_details(file_path)
+        if not is_valid:
+            self._show_alert('文件无效', message)
+            return None
+        
+        # 获取文件信息
+        file_info = FileEntry(
+            path=file_path,
+            name=os.path.basename(file_path),
+            size_mb=size_mb,
+            type=file_type
+        )
+        
+        return file_info if self._append_entry(file_info) else None
+    
+    def _append_entry(self, file_info: FileEntry) -> bool:
+        """将已验证的条目追加到列表（不刷新表格）"""
+        # 检查是否已存在
+        if file_info.path in self._file_paths:
+            self.update_status('文件已存在于列表中')
+            return False
+        
+        self.file_list.append(file_info)
+        self._file_paths.add(file_info.path)
+        logger.info("添加文件成功: %s", file_info.path)
+        return True
+    
+    def _insert_rows(self, start: int):
+        """刷新从start开始新追加的表格行"""
+        try:
+            self.file_table.insert_rows([(0, row) for row in range(start, len(self.file_list))])
+        except Exception:
+            self.file_table.reload()
+    
     def add_file(self, file_path: str) -> bool:
         """添加文件到列表"""
         try:
-            from ..utils.file_utils import FileUtils
-            
-            # 验证文件
-            is_valid, message = FileUtils.validate_file(file_path)
-            if not is_valid:
-                self._show_alert('文件无效', message)
+            file_info = self._append_file_info(file_path)
+            if file_info is None:
                 return False
             
-            # 检查是否已存在
-            if any(f['path'] == file_path for f in self.file_list):
-                self.update_status('文件已存在于列表中')
-                return False
-            
-            # 获取文件信息
-            file_info = {
-                'path': file_path,
-                'name': os.path.basename(file_path),
-                'size_mb': FileUtils.get_file_size_mb(file_path),
-                'type': FileUtils.is_supported_format(file_path)[1]
-            }
-            
-            self.file_list.append(file_info)
-            self.file_table.reload()
-            
-            self.update_status(f'已添加文件: {file_info["name"]}')
-            logger.info(f"添加文件成功: {file_path}")
+            self._insert_rows(len(self.file_list) - 1)
+            self.update_status(f'已添加文件: {file_info.name}')
             return True
         
         except Exception as e:
-            logger.exception(f"添加文件异常: {file_path}")
+            logger.exception("添加文件异常: %s", file_path)
             self._show_alert('错误', f'添加文件失败: {str(e)}')
             return False
     
+    def add_files(self, file_paths: List[str]) -> int:
+        """批量添加文件，只刷新一次表格，返回成功添加的数量"""
+        start = len(self.file_list)
+        for file_path in file_paths:
+            try:
+                self._append_file_info(file_path)
+            except Exception as e:
+                logger.exception("添加文件异常: %s", file_path)
+        
+        added_count = len(self.file_list) - start
+        if added_count:
+            self._insert_rows(start)
+        return added_count
+    
     def remove_file(self, index: int):
         """移除文件"""
         try:
-            if 0 <= index < len(self.file_list):
-                removed_file = self.file_list.pop(index)
+            if not 0 <= index < len(self.file_list):
+                return
+            
+            removed_file = self.file_list.pop(index)
+            self._file_paths.discard(removed_file.path)
+            # 移除行之后的选中索引前移一位
+            self.selected_indices = {
+                i if i < index else i - 1
+                for i in self.selected_indices if i != index
+            }
+            self.file_table.data_source.discard(removed_file)
+            try:
+                self.file_table.delete_rows([(0, index)])
+            except Exception:
                 self.file_table.reload()
-                self.update_status(f'已移除文件: {removed_file["name"]}')
+            self.update_status(f'已移除文件: {removed_file.name}')
         except Exception as e:
-            logger.exception(f"移除文件异常: {index}")
+            logger.exception("移除文件异常: %s", index)
     
     def update_status(self, message: str):
         """更新状态显示"""
         try:
-            self.status_label.text = message
-            logger.info(f"状态更新: {message}")
+            if message == self._last_status:
+                return
+            self._last_status = message
+            # 状态栏尚未创建时只记录，创建时再显示
+            if self.status_label is not None:
+                self.status_label.text = message
+            logger.info("状态更新: %s", message)
         except Exception as e:
-            logger.error(f"更新状态失败: {e}")
+            logger.error("更新状态失败: %s", e)
     
     def _show_alert(self, title: str, message: str):
         """显示警告对话框"""
         try:
-            import console
             console.alert(title, message, 'OK', hide_cancel_button=True)
         except Exception as e:
-            logger.error(f"显示警告对话框失败: {e}")
+            logger.error("显示警告对话框失败: %s", e)
             print(f"{title}: {message}")
     
     def show(self):
         """显示主界面"""
         try:
             self.view.present('sheet', hide_title_bar=False)
+            ui.delay(self._create_deferred_ui, 0)
         except Exception as e:
             logger.exception("显示主界面异常")
             raise
@@ -508,8 +720,67 @@ class MainView:
 class FileTableDataSource:
     """文件列表数据源"""
     
+    # 缓存的单元格上限，略多于一屏可见的行数（行高60）
+    _CELL_POOL_SIZE = 24
+    # 待复用的空闲单元格上限
+    _FREE_CELLS_SIZE = 8
+    
+    # 文件类型图标，首次创建数据源时加载，所有实例共享
+    _ICONS: Optional[Dict[str, ui.Image]] = None
+    
     def __init__(self, main_view):
         self.main_view = main_view
+        if FileTableDataSource._ICONS is None:
+            FileTableDataSource._ICONS = {
+                'audio': ui.Image.named('iob:ios7_musical_notes_32'),
+                'video': ui.Image.named('iob:ios7_videocam_32'),
+            }
+        # 单元格缓存，按文件路径索引，按最近使用顺序排列
+        self._cell_pool: 'OrderedDict[str, ui.TableViewCell]' = OrderedDict()
+        # 已失效的单元格，重建时优先复用
+        self._free_cells: List[ui.TableViewCell] = []
+    
+    def invalidate(self):
+        """清空单元格缓存（文件列表清空后调用），回收单元格供后续复用"""
+        for cell in self._cell_pool.values():
+            self._recycle(cell)
+        self._cell_pool.clear()
+    
+    def discard(self, file_info: FileEntry):
+        """移除单个条目的缓存单元格（条目被移除后调用），回收供后续复用"""
+        cell = self._cell_pool.pop(file_info.path, None)
+        if cell is not None:
+            self._recycle(cell)
+    
+    def _recycle(self, cell: ui.TableViewCell):
+        """把单元格放入空闲列表，超过上限的直接丢弃"""
+        if len(self._free_cells) < self._FREE_CELLS_SIZE:
+            self._free_cells.append(cell)
+    
+    def _build_cell(self, file_info: FileEntry, row: int) -> ui.TableViewCell:
+        """创建文件单元格
+        
+        ui.TableView的数据源必须返回ui.TableViewCell，无法直接复用
+        UITableView的dequeue队列，因此由_cell_pool和_free_cells承担复用职责，
+        只有在没有可回收单元格时才新建。
+        """
+        if self._free_cells:
+            cell = self._free_cells.pop()
+        else:
+            cell = ui.TableViewCell('subtitle')
+        cell.text_label.text = file_info.name
+        cell.detail_text_label.text = file_info.subtitle
+        
+        # 添加文件类型图标
+        cell.image_view.image = FileTableDataSource._ICONS.get(file_info.type)
+        
+        # 回收的单元格需要恢复选中状态
+        if row in self.main_view.selected_indices:
+            cell.accessory_type = 'checkmark'
+        else:
+            cell.accessory_type = 'none'
+        
+        return cell
     
     def tableview_number_of_sections(self, tableview):
         return 1
@@ -521,19 +792,20 @@ class FileTableDataSource:
         try:
             file_info = self.main_view.file_list[row]
             
-            cell = ui.TableViewCell('subtitle')
-            cell.text_label.text = file_info['name']
-            cell.detail_text_label.text = f"{file_info['size_mb']:.1f}MB • {file_info['type']}"
-            
-            # 添加文件类型图标
-            if file_info['type'] == 'audio':
-                cell.image_view.image = ui.Image.named('iob:ios7_musical_notes_32')
-            elif file_info['type'] == 'video':
-                cell.image_view.image = ui.Image.named('iob:ios7_videocam_32')
-            
+            cell = self._cell_pool.get(file_info.path)
+            if cell is not None:
+                self._cell_pool.move_to_end(file_info.path)
+                return cell
+            
+            cell = self._build_cell(file_info, row)
+            self._cell_pool[file_info.path] = cell
+            # 超过上限时淘汰最久未显示的单元格（已滚出屏幕）
+            if len(self._cell_pool) > self._CELL_POOL_SIZE:
+                _, stale = self._cell_pool.popitem(last=False)
+                self._recycle(stale)
             return cell
         except Exception as e:
-            logger.error(f"创建表格单元格异常: {e}")
+            logger.error("创建表格单元格异常: %s", e)
             cell = ui.TableViewCell()
             cell.text_label.text = "错误"
             return cell
@@ -546,24 +818,23 @@ class FileTableDelegate:
     
     def tableview_did_select(self, tableview, section, row):
         try:
-            file_info = self.main_view.file_list[row]
+            selected_indices = self.main_view.selected_indices
             
             # 切换选中状态
-            if file_info in self.main_view.selected_files:
-                self.main_view.selected_files.remove(file_info)
+            if row in selected_indices:
+                selected_indices.discard(row)
+                accessory_type = 'none'
             else:
-                self.main_view.selected_files.append(file_info)
+                selected_indices.add(row)
+                accessory_type = 'checkmark'
             
             # 更新显示
             cell = tableview.cell_for_row(ui.Path((section, row)))
             if cell:
-                if file_info in self.main_view.selected_files:
-                    cell.accessory_type = 'checkmark'
-                else:
-                    cell.accessory_type = 'none'
+                cell.accessory_type = accessory_type
         
         except Exception as e:
-            logger.error(f"选择表格行异常: {e}")
+            logger.error("选择表格行异常: %s", e)
     
     def tableview_can_delete(self, tableview, section, row):
         return True
@@ -572,4 +843,4 @@ class FileTableDelegate:
         try:
             self.main_view.remove_file(row)
         except Exception as e:
-            logger.error(f"删除表格行异常: {e}")
\ No newline at end of file
+            logger.error("删除表格行异常: %s", e)
\ No newline at end of file
@@ -5,13 +5,30 @@
 """
 
 import ui
+import logging
 import threading
 import time
+import statistics
+import itertools
+from collections import deque
+from functools import partial
 from typing import Optional, Callable
 from ..utils.logger import get_logger
 
+try:
+    from objc_util import ObjCClass
+    _CATransaction = ObjCClass('CATransaction')
+except ImportError:
+    _CATransaction = None
+
 logger = get_logger(__name__)
 
+# 标题栏百分比文本，百分比只有101种取值，预先生成
+_PROGRESS_TITLES = tuple(f'处理进度 ({percent}%)' for percent in range(101))
+
+# 界面不可见时刷新定时器的检查间隔（秒）
+_HIDDEN_TICK_INTERVAL = 0.25
+
 class ProgressView:
     """进度界面类"""
     
@@ -25,6 +42,38 @@ class ProgressView:
         self.is_cancelled = False
         self.cancel_callback = None
         
+        # 进度更新合并：_pending是只保留最新值的单槽，由主线程定时器每帧取走一次
+        # 生产者只做属性赋值（GIL下原子），不加锁也不调度；_flushed记录已写入界面的那次更新
+        self._pending = None
+        self._flushed = None
+        # 文本版本号：状态/详情/步骤文本变化时递增，刷新时版本未变则只更新进度条
+        self._label_gens = itertools.count(1)
+        self._labels_gen = 0
+        self._submitted_labels = None
+        self._flushed_gen = -1
+        self._min_interval = 1 / 60
+        # 主线程刷新定时器，每次启动使用新的停止事件，旧的定时链不会被重新激活
+        self._ticker_stop = threading.Event()
+        self._ticker_stop.set()
+        # 工作线程提交进度时可能重新启动定时器，检查与启动需要互斥
+        self._ticker_lock = threading.Lock()
+        # 已显示且未调用hide()，定时器意外停止时由update_progress重新启动
+        self._shown = False
+        # 最近的界面刷新耗时，用于在界面线程跟不上时自动放宽刷新间隔
+        self._flush_times = deque(maxlen=32)
+        # 最近一次写入界面的值，未变化时跳过写入
+        self._last = {'pw': None, 'status': None, 'detail': None, 'pct': None, 'step': None}
+        # 不确定进度动画状态，由刷新定时器驱动
+        self._animating = False
+        self._indeterminate_phase = 0.0
+        self._indeterminate_dir = 1
+        self._last_tick = 0.0
+        # 可见性检查结果缓存200ms，不可见时只记录进度不刷新界面
+        self._visible = False
+        self._visible_checked_at = 0.0
+        # 是否有父视图（决定是否更新标题），每次显示后首次刷新时查询一次
+        self._has_superview = None
+        
         self._create_ui()
     
     def _get_dynamic_size(self):
@@ -61,16 +110,31 @@ class ProgressView:
             # 返回合理的默认尺寸
             return 350, 220
     
+    @classmethod
+    def _layout_spec(cls, width: float, height: float) -> dict:
+        """各组件的位置表（子类覆盖以调整布局，组件创建时一次放到位）"""
+        return {
+            'view': (0, 0, width, height),
+            'title_label': (0, 20, width, 30),
+            'progress_bar': (20, 70, width - 40, 10),
+            'status_label': (20, 100, width - 40, 25),
+            'detail_label': (20, 130, width - 40, 35),
+            'cancel_button': (width / 2 - 40, 175, 80, 35),
+        }
+    
     def _create_ui(self):
         """创建进度界面"""
         try:
             # 获取动态尺寸
             width, height = self._get_dynamic_size()
+            layout = self._layout = self._layout_spec(width, height)
             
             # 主视图
             self.view = ui.View(name='处理进度')
             self.view.background_color = '#f0f0f0'
-            self.view.frame = (0, 0, width, height)
+            self.view.frame = layout['view']
+            # 缓存进度条可填充宽度，避免每次更新都读取视图属性
+            self._fill_max_w = layout['progress_bar'][2]
             
             # 标题
             title_label = ui.Label(name='title_label')
@@ -78,7 +142,7 @@ class ProgressView:
             title_label.font = ('<system-bold>', 18)
             title_label.text_color = '#333333'
             title_label.alignment = ui.ALIGN_CENTER
-            title_label.frame = (0, 20, self.view.width, 30)
+            title_label.frame = layout['title_label']
             title_label.flex = 'W'
             self.view.add_subview(title_label)
             
@@ -86,7 +150,7 @@ class ProgressView:
             self.progress_bar = ui.View(name='progress_container')
             self.progress_bar.background_color = '#e0e0e0'
             self.progress_bar.corner_radius = 5
-            self.progress_bar.frame = (20, 70, self.view.width - 40, 10)
+            self.progress_bar.frame = layout['progress_bar']
             self.progress_bar.flex = 'W'
             self.view.add_subview(self.progress_bar)
             
@@ -103,7 +167,7 @@ class ProgressView:
             self.status_label.font = ('<system>', 16)
             self.status_label.text_color = '#666666'
             self.status_label.alignment = ui.ALIGN_CENTER
-            self.status_label.frame = (20, 100, self.view.width - 40, 25)
+            self.status_label.frame = layout['status_label']
             self.status_label.flex = 'W'
             self.view.add_subview(self.status_label)
             
@@ -114,7 +178,7 @@ class ProgressView:
             self.detail_label.text_color = '#999999'
             self.detail_label.alignment = ui.ALIGN_CENTER
             self.detail_label.number_of_lines = 2
-            self.detail_label.frame = (20, 130, self.view.width - 40, 35)
+            self.detail_label.frame = layout['detail_label']
             self.detail_label.flex = 'W'
             self.view.add_subview(self.detail_label)
             
@@ -125,7 +189,7 @@ class ProgressView:
             self.cancel_button.background_color = '#FF3B30'
             self.cancel_button.tint_color = 'white'
             self.cancel_button.corner_radius = 8
-            self.cancel_button.frame = (self.view.width/2 - 40, 175, 80, 35)
+            self.cancel_button.frame = layout['cancel_button']
             self.cancel_button.flex = 'LR'
             self.cancel_button.action = self._cancel_action
             self.view.add_subview(self.cancel_button)
@@ -140,45 +204,144 @@ class ProgressView:
         """
         更新进度显示
         
+        高频调用会被合并，界面按刷新间隔只显示最新一次的进度。
+        
         Args:
             progress: 进度值 (0.0 - 1.0)
             status: 状态文本
             detail: 详细信息
         """
+        # 只写入单槽，由主线程定时器取走，工作线程从不阻塞
+        # 槽内为(进度, 状态, 详情, 步骤文本, 文本版本号)，步骤文本为None表示不更新步骤指示器
+        labels = (status, detail, None)
+        if labels != self._submitted_labels:
+            self._submitted_labels = labels
+            self._labels_gen = next(self._label_gens)
+        self._pending = (progress, status, detail, None, self._labels_gen)
+        self._ensure_ticker()
+    
+    def _ensure_ticker(self):
+        """界面显示期间定时器已停止时重新启动，避免进度停留在单槽中不再刷新"""
+        if self._shown and self._ticker_stop.is_set():
+            self._start_ticker()
+    
+    def _start_ticker(self):
+        """启动主线程刷新定时器（已在运行时不重复启动）"""
+        with self._ticker_lock:
+            if not self._ticker_stop.is_set():
+                return
+            self._ticker_stop = threading.Event()
+            self._last_tick = time.monotonic()
+            ui.delay(partial(self._tick, self._ticker_stop), 0)
+    
+    def _stop_ticker(self):
+        """停止主线程刷新定时器"""
+        with self._ticker_lock:
+            self._ticker_stop.set()
+    
+    def _tick(self, stop_event: threading.Event):
+        """刷新定时器的一帧：取走最新进度写入界面，并推进不确定进度动画"""
+        if stop_event.is_set():
+            return
+        if not self._is_visible_cached():
+            # 界面暂不可见（刚弹出或被遮挡）：不写入界面，放慢频率继续检查，可见后恢复刷新
+            ui.delay(partial(self._tick, stop_event), _HIDDEN_TICK_INTERVAL)
+            return
+        
+        now = time.monotonic()
+        elapsed = now - self._last_tick
+        self._last_tick = now
+        
+        # 异常只在定时器这一层捕获，每帧执行的刷新与动画代码内不再设置try
         try:
-            # 确保在主线程中更新UI
-            def update_ui():
-                try:
-                    # 更新进度条
-                    self.progress_value = max(0.0, min(1.0, progress))
-                    progress_width = self.progress_bar.width * self.progress_value
-                    self.progress_fill.frame = (0, 0, progress_width, 10)
-                    
-                    # 更新文本
+            self._flush_inner()
+            if self._animating and not self.is_cancelled:
+                self._tick_indeterminate(elapsed)
+        except Exception:
+            logger.exception("刷新进度界面异常")
+            self._animating = False
+        finally:
+            # 无论本帧是否出错都安排下一帧，定时器不会因一次异常而停止
+            ui.delay(partial(self._tick, stop_event), self._min_interval)
+    
+    def _flush(self):
+        """将最新的进度写入界面"""
+        try:
+            self._flush_inner()
+        except Exception:
+            logger.exception("刷新进度界面异常")
+    
+    def _flush_inner(self):
+        """将最新的进度写入界面（不捕获异常，由调用方处理）"""
+        pending = self._pending
+        if pending is None or pending is self._flushed:
+            return
+        if not self._is_visible_cached():
+            # 界面不可见：只记录进度值，显示时再补一次刷新
+            self.progress_value = max(0.0, min(1.0, pending[0]))
+            return
+        self._flushed = pending
+        
+        flush_start = time.monotonic()
+        progress, status, detail, step_text, labels_gen = pending
+        # 常用属性先绑定为局部变量，避免每次访问都经过属性查找和桥接
+        last = self._last
+        view = self.view
+        ca = _CATransaction
+        
+        # 一次刷新内的多次写入合并到同一个事务中，只触发一次布局与重绘
+        # （批量更新模式，同时关闭隐式动画）
+        if ca is not None:
+            ca.begin()
+            ca.setDisableActions_(True)
+        try:
+            # 更新进度条（按整像素比较，避免亚像素抖动引起重复写入）
+            value = max(0.0, min(1.0, progress))
+            self.progress_value = value
+            progress_width = round(self._fill_max_w * value)
+            if progress_width != last['pw']:
+                self.progress_fill.frame = (0, 0, progress_width, 10)
+                last['pw'] = progress_width
+            
+            # 更新进度百分比显示（是否有父视图在每次显示后只查询一次）
+            percent = int(value * 100)
+            if percent != last['pct']:
+                has_superview = self._has_superview
+                if has_superview is None:
+                    has_superview = self._has_superview = bool(getattr(view, 'superview', None))
+                if has_superview:
+                    view.name = _PROGRESS_TITLES[percent]
+                    last['pct'] = percent
+            
+            # 文本版本号未变时只是进度变化（常见情况），跳过所有文本写入
+            if labels_gen != self._flushed_gen:
+                self._flushed_gen = labels_gen
+                
+                # 更新文本
+                if status != last['status']:
                     self.status_label.text = status
-                    if detail:
-                        self.detail_label.text = detail
-                    
-                    # 更新进度百分比显示
-                    percent = int(self.progress_value * 100)
-                    if hasattr(self.view, 'superview') and self.view.superview:
-                        self.view.name = f'处理进度 ({percent}%)'
-                    
-                    logger.debug(f"进度更新: {percent}% - {status}")
+                    last['status'] = status
+                if detail and detail != last['detail']:
+                    self.detail_label.text = detail
+                    last['detail'] = detail
                 
-                except Exception as e:
-                    logger.error(f"更新进度UI异常: {e}")
-            
-            # 在主线程中执行UI更新
-            if threading.current_thread() == threading.main_thread():
-                update_ui()
-            else:
-                # 如果在其他线程中，需要调度到主线程
-                import dispatch
-                dispatch.async_main(update_ui)
+                # 更新步骤指示器（多步骤界面）
+                if step_text is not None and step_text != last['step']:
+                    steps_label = self.steps_label
+                    if steps_label:
+                        steps_label.text = step_text
+                        last['step'] = step_text
+        finally:
+            if ca is not None:
+                ca.commit()
         
-        except Exception as e:
-            logger.error(f"更新进度异常: {e}")
+        # 调试日志默认关闭，先判断级别，避免每帧构造日志字符串
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("进度更新: %d%% - %s", percent, status)
+        
+        # 刷新间隔取最近刷新耗时中位数的两倍，最快60fps
+        self._flush_times.append(time.monotonic() - flush_start)
+        self._min_interval = max(1 / 60, 2 * statistics.median(self._flush_times))
     
     def set_indeterminate(self, indeterminate: bool = True):
         """设置为不确定进度模式"""
@@ -194,53 +357,38 @@ class ProgressView:
     
     def _start_indeterminate_animation(self):
         """开始不确定进度动画"""
-        def animate():
-            while not self.is_cancelled and hasattr(self, '_indeterminate_running'):
-                try:
-                    # 创建来回移动的动画效果
-                    for i in range(20):
-                        if self.is_cancelled or not hasattr(self, '_indeterminate_running'):
-                            break
-                        
-                        progress = i / 20.0
-                        self.update_progress(progress, self.status_label.text)
-                        time.sleep(0.1)
-                    
-                    for i in range(20, 0, -1):
-                        if self.is_cancelled or not hasattr(self, '_indeterminate_running'):
-                            break
-                        
-                        progress = i / 20.0
-                        self.update_progress(progress, self.status_label.text)
-                        time.sleep(0.1)
-                
-                except Exception as e:
-                    logger.error(f"不确定进度动画异常: {e}")
-                    break
-        
-        try:
-            self._indeterminate_running = True
-            self._animation_thread = threading.Thread(target=animate, daemon=True)
-            self._animation_thread.start()
+        if self._animating:
+            return
+        self._indeterminate_phase = 0.0
+        self._indeterminate_dir = 1
+        self._animating = True
+    
+    def _tick_indeterminate(self, elapsed: float):
+        """推进不确定进度动画（在主线程中由刷新定时器驱动，不捕获异常）"""
+        # 来回移动的动画效果，按经过时间推进，每秒移动1.5个进度条宽度
+        phase = self._indeterminate_phase + self._indeterminate_dir * 1.5 * elapsed
+        if phase >= 1.0 or phase <= 0.0:
+            phase = max(0.0, min(1.0, phase))
+            self._indeterminate_dir = -self._indeterminate_dir
+        self._indeterminate_phase = phase
         
-        except Exception as e:
-            logger.error(f"启动不确定进度动画异常: {e}")
+        self.progress_fill.frame = (0, 0, self._fill_max_w * phase, 10)
+        self._last['pw'] = None
     
     def _stop_indeterminate_animation(self):
         """停止不确定进度动画"""
-        try:
-            if hasattr(self, '_indeterminate_running'):
-                delattr(self, '_indeterminate_running')
-        except Exception as e:
-            logger.error(f"停止不确定进度动画异常: {e}")
+        self._animating = False
     
     def _cancel_action(self, sender):
         """取消操作"""
         try:
             self.is_cancelled = True
+            self._stop_indeterminate_animation()
             
             # 更新UI显示
             self.status_label.text = '正在取消...'
+            self._last['status'] = self.status_label.text
+            self._flushed_gen = -1
             self.cancel_button.enabled = False
             self.cancel_button.title = '取消中'
             
@@ -272,6 +420,9 @@ class ProgressView:
                 self.progress_fill.background_color = '#FF3B30'  # 红色
                 self.status_label.text = '处理失败'
                 self.detail_label.text = message
+                self._last['status'] = self.status_label.text
+                self._last['detail'] = message
+                self._flushed_gen = -1
                 self.cancel_button.title = '关闭'
                 self.cancel_button.background_color = '#FF3B30'
             
@@ -318,6 +469,19 @@ class ProgressView:
             else:
                 # 作为独立视图显示
                 self.view.present('popover', hide_title_bar=False)
+            
+            # 显示后布局可能改变宽度，刷新缓存的进度条宽度
+            self._fill_max_w = self.progress_bar.width
+            self._last['pw'] = None
+            
+            # 刚显示时视为可见，补刷一次使界面与最新进度一致
+            self._visible = True
+            self._visible_checked_at = time.monotonic()
+            self._has_superview = None
+            self._flushed = None
+            self._flush()
+            self._shown = True
+            self._start_ticker()
         
         except Exception as e:
             logger.exception("显示进度界面异常")
@@ -325,7 +489,10 @@ class ProgressView:
     def hide(self):
         """隐藏进度界面"""
         try:
+            self._shown = False
             self._stop_indeterminate_animation()
+            self._stop_ticker()
+            self._has_superview = None
             
             if self.view.superview:
                 self.view.remove_from_superview()
@@ -335,6 +502,14 @@ class ProgressView:
         except Exception as e:
             logger.error(f"隐藏进度界面异常: {e}")
     
+    def _is_visible_cached(self) -> bool:
+        """带200ms缓存的可见性检查"""
+        now = time.monotonic()
+        if now - self._visible_checked_at > 0.2:
+            self._visible = self.is_visible()
+            self._visible_checked_at = now
+        return self._visible
+    
     def is_visible(self) -> bool:
         """检查进度界面是否可见"""
         try:
@@ -351,40 +526,44 @@ class MultiStepProgressView(ProgressView):
         self.current_step = 0
         self.step_progress = 0.0
         
+        # 预先生成步骤文本和步数倒数，更新时无需格式化和除法
+        self._step_labels = [f'步骤 {i + 1}/{len(steps)}: {step}' for i, step in enumerate(steps)]
+        self._n_steps_inv = 1.0 / len(steps) if steps else 0.0
+        self.steps_label = None
         super().__init__()
         
         # 添加步骤指示器
         self._create_step_indicator()
     
+    @classmethod
+    def _layout_spec(cls, width: float, height: float) -> dict:
+        """多步骤布局：进度区域下移，并为步骤指示器增加高度"""
+        progress_y = height * 0.45  # 45% of height
+        status_y = progress_y + 30
+        detail_y = status_y + 35
+        button_y = detail_y + 45
+        
+        layout = super()._layout_spec(width, height)
+        layout.update({
+            'view': (0, 0, width, height + 30),
+            'steps_label': (20, progress_y - 35, width - 40, 20),
+            'progress_bar': (20, progress_y, width - 40, 10),
+            'status_label': (20, status_y, width - 40, 25),
+            'detail_label': (20, detail_y, width - 40, 35),
+            'cancel_button': (width / 2 - 40, button_y, 80, 35),
+        })
+        return layout
+    
     def _create_step_indicator(self):
         """创建步骤指示器"""
         try:
-            # 获取基础高度用于动态布局
-            width, base_height = self._get_dynamic_size()
-            
-            # 调整现有组件位置 - 使用动态计算
-            progress_y = base_height * 0.45  # 45% of height
-            status_y = progress_y + 30
-            detail_y = status_y + 35
-            button_y = detail_y + 45
-            
-            self.progress_bar.frame = (20, progress_y, self.view.width - 40, 10)
-            self.status_label.frame = (20, status_y, self.view.width - 40, 25)
-            self.detail_label.frame = (20, detail_y, self.view.width - 40, 35)
-            self.cancel_button.frame = (self.view.width/2 - 40, button_y, 80, 35)
-            
-            # 扩展视图高度 - 动态计算
-            width, base_height = self._get_dynamic_size()
-            extended_height = base_height + 30  # 为步骤指示器添加额外高度
-            self.view.frame = (0, 0, width, extended_height)
-            
-            # 步骤指示器
+            # 步骤指示器（其余组件已由布局表放到位）
             steps_label = ui.Label(name='steps_label')
-            steps_label.text = f'步骤 1/{len(self.steps)}: {self.steps[0] if self.steps else ""}'
+            steps_label.text = self._step_labels[0] if self._step_labels else '步骤 1/0: '
             steps_label.font = ('<system>', 14)
             steps_label.text_color = '#007AFF'
             steps_label.alignment = ui.ALIGN_CENTER
-            steps_label.frame = (20, progress_y - 35, self.view.width - 40, 20)
+            steps_label.frame = self._layout['steps_label']
             steps_label.flex = 'W'
             self.view.add_subview(steps_label)
             
@@ -395,26 +574,23 @@ class MultiStepProgressView(ProgressView):
     
     def update_step(self, step_index: int, step_progress: float = 0.0, status: str = '', detail: str = ''):
         """更新步骤进度"""
-        try:
-            if 0 <= step_index < len(self.steps):
-                self.current_step = step_index
-                self.step_progress = step_progress
-                
-                # 计算总进度
-                total_progress = (step_index + step_progress) / len(self.steps)
-                
-                # 更新步骤显示
-                if hasattr(self, 'steps_label'):
-                    self.steps_label.text = f'步骤 {step_index + 1}/{len(self.steps)}: {self.steps[step_index]}'
-                
-                # 更新状态
-                if not status:
-                    status = f'正在执行: {self.steps[step_index]}'
-                
-                self.update_progress(total_progress, status, detail)
-        
-        except Exception as e:
-            logger.error(f"更新步骤进度异常: {e}")
+        if 0 <= step_index < len(self.steps):
+            self.current_step = step_index
+            self.step_progress = step_progress
+            
+            # 更新状态
+            if not status:
+                status = f'正在执行: {self.steps[step_index]}'
+            
+            # 总进度与步骤文本一起写入单槽，步骤指示器在同一次刷新中更新（未变化时跳过）
+            step_text = self._step_labels[step_index]
+            labels = (status, detail, step_text)
+            if labels != self._submitted_labels:
+                self._submitted_labels = labels
+                self._labels_gen = next(self._label_gens)
+            self._pending = ((step_index + step_progress) * self._n_steps_inv,
+                             status, detail, step_text, self._labels_gen)
+            self._ensure_ticker()
     
     def next_step(self, status: str = '', detail: str = ''):
         """进入下一步骤"""
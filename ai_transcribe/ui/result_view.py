@@ -6,11 +6,103 @@
 
 import ui
 import os
+import json
+import tempfile
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache, partial
 from typing import Optional, Dict, Any
 from ..utils.logger import get_logger
 
+# iOS相关模块在模块加载时导入一次，按钮操作中不再导入
+try:
+    import clipboard
+except ImportError:
+    clipboard = None
+
+try:
+    import console
+except ImportError:
+    console = None
+
+try:
+    import appex
+except ImportError:
+    appex = None
+
+try:
+    import dialogs
+except ImportError:
+    dialogs = None
+
+try:
+    from objc_util import on_main_thread
+except ImportError:
+    # 不在iOS环境中，直接调用
+    def on_main_thread(func):
+        return func
+
 logger = get_logger(__name__)
 
+# 长文本分窗显示：文本视图中只放入当前窗口的内容，光标接近窗口边缘时平移窗口
+_WINDOW_SIZE = 64 * 1024
+_WINDOW_MARGIN = 4 * 1024
+_HEAD_MARK = '… 上文省略 …\n'
+_TAIL_MARK = '\n… 下文省略 …'
+
+# 超过此长度的结果先截断显示，余下内容通过"显示全部"加载
+_MAX_DISPLAY = 200_000
+_OVERFLOW_MARK = '\n\n… 内容过长，已截断，点击"显示全部"查看余下 {n} 字符 …'
+
+# 小于此长度的内容直接以文本分享，不写临时文件
+_SHARE_TEXT_LIMIT = 64 * 1024
+
+# 保存文件时按模板选择文件名前缀
+_FILE_PREFIXES = {
+    'meeting_notes': "会议纪要",
+    'study_notes': "学习笔记",
+    'content_summary': "内容摘要",
+}
+_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# 界面颜色与字体
+_COLOR_BG = '#f0f0f0'
+_COLOR_CARD = '#ffffff'
+_COLOR_SEP = '#e0e0e0'
+_COLOR_TEXT = '#333333'
+_COLOR_BLUE = '#007AFF'
+_COLOR_GREEN = '#34C759'
+_COLOR_ORANGE = '#FF9500'
+_COLOR_GRAY = '#8E8E93'
+_BUTTON_FONT = ('<system>', 14)
+
+def _has_content(text: str) -> bool:
+    """判断文本是否包含非空白字符（不复制整个文本）"""
+    # 通常开头就有非空白字符，只检查前64个字符；前64个都是空白时再完整检查
+    if not text:
+        return False
+    if not text[:64].isspace():
+        return True
+    return len(text) > 64 and not text.isspace()
+
+def _write_text_file(path: str, text: str):
+    """一次编码为UTF-8后直接写入文件描述符，不经过文本模式的编码缓冲"""
+    data = memoryview(text.encode('utf-8'))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+    finally:
+        os.close(fd)
+
+@lru_cache(maxsize=128)
+def _measure(message: str, font_name: str, font_size: float, max_width: float):
+    """测量文本尺寸（结果缓存，重复的提示消息无需再次排版）"""
+    size = ui.measure_string(message, font=(font_name, font_size), max_width=max_width)
+    return size[0], size[1]
+
 class ResultView:
     """结果预览界面类"""
     
@@ -21,13 +113,31 @@ class ResultView:
         self.toolbar = None
         self.result_data = {}
         
+        # 完整文本保存在这里，文本视图只显示其中[start, end)窗口
+        self._full_text = ''
+        self._window = (0, 0)
+        self._head_len = 0
+        self._window_dirty = False
+        self._shifting = False
+        # 按钮状态对应的有无内容，None表示尚未设置
+        self._had_content = None
+        # 截断后尚未显示的内容及截断提示
+        self._overflow_text = ''
+        self._overflow_marker = ''
+        # 文件名时间戳缓存1秒，连续的保存/分享操作共用
+        self._ts_cached = ''
+        self._ts_time = float('-inf')
+        # 复用的提示视图，_toast_gen用于使过期的隐藏回调失效
+        self._toast_view = None
+        self._toast_label = None
+        self._toast_gen = 0
+        
         self._create_ui()
     
     def _get_screen_size(self):
         """获取屏幕尺寸"""
         try:
             # 尝试获取实际屏幕尺寸
-            import console
             if hasattr(console, 'get_window_size'):
                 console_size = console.get_window_size()
                 width = max(375, console_size[0] * 10)
@@ -35,11 +145,11 @@ class ResultView:
             else:
                 width, height = 375, 667
                 
-            logger.debug(f"屏幕尺寸: {width}x{height}")
+            logger.debug("屏幕尺寸: %sx%s", width, height)
             return width, height
             
         except Exception as e:
-            logger.warning(f"获取屏幕尺寸失败，使用默认值: {e}")
+            logger.warning("获取屏幕尺寸失败，使用默认值: %s", e)
             return 375, 667
     
     def _create_ui(self):
@@ -50,7 +160,7 @@ class ResultView:
             
             # 主视图
             self.view = ui.View(name='处理结果')
-            self.view.background_color = '#f0f0f0'
+            self.view.background_color = _COLOR_BG
             self.view.frame = (0, 0, self.screen_width, self.screen_height)
             
             # 工具栏
@@ -74,7 +184,7 @@ class ResultView:
         
         # 工具栏背景
         toolbar_bg = ui.View(name='toolbar_bg')
-        toolbar_bg.background_color = '#ffffff'
+        toolbar_bg.background_color = _COLOR_CARD
         toolbar_bg.frame = (0, 0, self.screen_width, toolbar_height)
         toolbar_bg.flex = 'W'
         self.view.add_subview(toolbar_bg)
@@ -83,9 +193,10 @@ class ResultView:
         title_label = ui.Label(name='title_label')
         title_label.text = '处理结果'
         title_label.font = ('<system-bold>', max(16, int(self.screen_width / 20)))
-        title_label.text_color = '#333333'
+        title_label.text_color = _COLOR_TEXT
         title_label.frame = (20, (toolbar_height - 30) // 2, 200, 30)
         toolbar_bg.add_subview(title_label)
+        self._title_label = title_label
         
         # 关闭按钮
         button_size = max(30, int(toolbar_height * 0.6))
@@ -100,12 +211,22 @@ class ResultView:
         close_button.action = self._close_action
         toolbar_bg.add_subview(close_button)
         
+        # 显示全部按钮（内容被截断时才显示）
+        show_all_button = ui.Button(name='show_all_button')
+        show_all_button.title = '显示全部'
+        show_all_button.font = _BUTTON_FONT
+        show_all_button.tint_color = _COLOR_BLUE
+        show_all_button.frame = (self.screen_width - button_size - 100, 
+                                (toolbar_height - button_size) // 2, 
+                                80, button_size)
+        show_all_button.flex = 'L'
+        show_all_button.hidden = True
+        show_all_button.action = self._show_all_action
+        toolbar_bg.add_subview(show_all_button)
+        self._show_all_button = show_all_button
+        
         # 分隔线
-        separator = ui.View(name='separator')
-        separator.background_color = '#e0e0e0'
-        separator.frame = (0, toolbar_height - 1, self.screen_width, 1)
-        separator.flex = 'W'
-        self.view.add_subview(separator)
+        self._add_separator(self.view, toolbar_height - 1)
         
         # 保存工具栏高度
         self._toolbar_height = toolbar_height
@@ -119,13 +240,14 @@ class ResultView:
         self.text_view = ui.TextView(name='text_view')
         self.text_view.font = ('<system>', max(14, int(self.screen_width / 26)))
         self.text_view.editable = True
-        self.text_view.text_color = '#333333'
-        self.text_view.background_color = '#ffffff'
+        self.text_view.text_color = _COLOR_TEXT
+        self.text_view.background_color = _COLOR_CARD
         self.text_view.frame = (margin, 
                               self._toolbar_height + 10, 
                               self.screen_width - 2*margin, 
                               self.screen_height - self._toolbar_height - action_bar_height - 20)
         self.text_view.flex = 'WH'
+        self.text_view.delegate = self
         self.view.add_subview(self.text_view)
         
         # 保存动作栏高度
@@ -137,109 +259,74 @@ class ResultView:
         
         # 操作栏背景
         action_bg = ui.View(name='action_bg')
-        action_bg.background_color = '#ffffff'
+        action_bg.background_color = _COLOR_CARD
         action_bg.frame = (0, self.screen_height - self._action_bar_height, 
                           self.screen_width, self._action_bar_height)
         action_bg.flex = 'WT'
         self.view.add_subview(action_bg)
         
         # 分隔线
-        separator = ui.View(name='separator')
-        separator.background_color = '#e0e0e0'
-        separator.frame = (0, 0, self.screen_width, 1)
-        separator.flex = 'W'
-        action_bg.add_subview(separator)
+        self._add_separator(action_bg, 0)
         
         # 按钮尺寸
         button_height = max(35, int(self._action_bar_height * 0.6))
         button_width = int((self.screen_width - 4*margin) / 3)  # 3 buttons
         button_y = (self._action_bar_height - button_height) // 2
+        button_font = ('<system>', max(12, int(self.screen_width / 30)))
         
-        # 保存按钮
-        save_button = ui.Button(name='save_button')
-        save_button.title = '💾 保存'
-        save_button.font = ('<system>', max(12, int(self.screen_width / 30)))
-        save_button.background_color = '#007AFF'
-        save_button.tint_color = 'white'
-        save_button.corner_radius = 6
-        save_button.frame = (margin, button_y, button_width, button_height)
-        save_button.action = self._save_action
-        action_bg.add_subview(save_button)
-        
-        # 复制按钮
-        copy_button = ui.Button(name='copy_button')
-        copy_button.title = '📋 复制'
-        copy_button.font = ('<system>', max(12, int(self.screen_width / 30)))
-        copy_button.background_color = '#34C759'
-        copy_button.tint_color = 'white'
-        copy_button.corner_radius = 6
-        copy_button.frame = (margin + button_width + margin, button_y, button_width, button_height)
-        copy_button.action = self._copy_action
-        action_bg.add_subview(copy_button)
-        
-        # 分享按钮
-        share_button = ui.Button(name='share_button')
-        share_button.title = '📤 分享'
-        share_button.font = ('<system>', max(12, int(self.screen_width / 30)))
-        share_button.background_color = '#FF9500'
-        share_button.tint_color = 'white'
-        share_button.corner_radius = 6
-        share_button.frame = (self.screen_width - margin - button_width, button_y, button_width, button_height)
-        share_button.action = self._share_action
-        action_bg.add_subview(share_button)
-        separator.flex = 'W'
-        action_bg.add_subview(separator)
+        # 按屏幕宽度均分的按钮：(名称, 标题, 背景色, 位置, flex, 动作)
+        self._add_buttons(action_bg, button_font, (
+            ('save_button', '💾 保存', _COLOR_BLUE,
+             (margin, button_y, button_width, button_height), None, self._save_action),
+            ('copy_button', '📋 复制', _COLOR_GREEN,
+             (margin + button_width + margin, button_y, button_width, button_height), None, self._copy_action),
+            ('share_button', '📤 分享', _COLOR_ORANGE,
+             (self.screen_width - margin - button_width, button_y, button_width, button_height), None, self._share_action),
+        ))
         
         # 按钮容器
         button_container = ui.View(name='button_container')
-        button_container.frame = (0, 10, self.view.width, 40)
+        button_container.frame = (0, 10, self.screen_width, 40)
         button_container.flex = 'W'
         action_bg.add_subview(button_container)
         
-        # 复制按钮
-        copy_button = ui.Button(name='copy_button')
-        copy_button.title = '📋 复制'
-        copy_button.font = ('<system>', 14)
-        copy_button.background_color = '#007AFF'
-        copy_button.tint_color = 'white'
-        copy_button.corner_radius = 6
-        copy_button.frame = (10, 5, 80, 30)
-        copy_button.action = self._copy_action
-        button_container.add_subview(copy_button)
-        
-        # 分享按钮
-        share_button = ui.Button(name='share_button')
-        share_button.title = '📤 分享'
-        share_button.font = ('<system>', 14)
-        share_button.background_color = '#34C759'
-        share_button.tint_color = 'white'
-        share_button.corner_radius = 6
-        share_button.frame = (100, 5, 80, 30)
-        share_button.action = self._share_action
-        button_container.add_subview(share_button)
-        
-        # 保存按钮
-        save_button = ui.Button(name='save_button')
-        save_button.title = '💾 保存'
-        save_button.font = ('<system>', 14)
-        save_button.background_color = '#FF9500'
-        save_button.tint_color = 'white'
-        save_button.corner_radius = 6
-        save_button.frame = (190, 5, 80, 30)
-        save_button.action = self._save_action
-        button_container.add_subview(save_button)
-        
-        # 重新处理按钮
-        reprocess_button = ui.Button(name='reprocess_button')
-        reprocess_button.title = '🔄 重新处理'
-        reprocess_button.font = ('<system>', 14)
-        reprocess_button.background_color = '#8E8E93'
-        reprocess_button.tint_color = 'white'
-        reprocess_button.corner_radius = 6
-        reprocess_button.frame = (280, 5, 100, 30)
-        reprocess_button.flex = 'L'
-        reprocess_button.action = self._reprocess_action
-        button_container.add_subview(reprocess_button)
+        buttons = self._add_buttons(button_container, _BUTTON_FONT, (
+            ('copy_button', '📋 复制', _COLOR_BLUE, (10, 5, 80, 30), None, self._copy_action),
+            ('share_button', '📤 分享', _COLOR_GREEN, (100, 5, 80, 30), None, self._share_action),
+            ('save_button', '💾 保存', _COLOR_ORANGE, (190, 5, 80, 30), None, self._save_action),
+            ('reprocess_button', '🔄 重新处理', _COLOR_GRAY, (280, 5, 100, 30), 'L', self._reprocess_action),
+        ))
+        
+        # 保存需要随内容启用/禁用的按钮，避免每次按名称查找子视图
+        self._button_container = button_container
+        self._action_buttons = {name: buttons[name] for name in ('copy_button', 'share_button', 'save_button')}
+    
+    def _add_separator(self, parent: ui.View, y: float):
+        """在父视图中添加一条横向分隔线"""
+        separator = ui.View(name='separator')
+        separator.background_color = _COLOR_SEP
+        separator.frame = (0, y, self.screen_width, 1)
+        separator.flex = 'W'
+        parent.add_subview(separator)
+    
+    @staticmethod
+    def _add_buttons(parent: ui.View, font: tuple, specs: tuple) -> Dict[str, ui.Button]:
+        """按规格表批量创建按钮并添加到父视图"""
+        buttons = {}
+        for name, title, bg_color, frame, flex, action in specs:
+            button = ui.Button(name=name)
+            button.title = title
+            button.font = font
+            button.background_color = bg_color
+            button.tint_color = 'white'
+            button.corner_radius = 6
+            button.frame = frame
+            if flex:
+                button.flex = flex
+            button.action = action
+            parent.add_subview(button)
+            buttons[name] = button
+        return buttons
     
     def show_result(self, result_data: Dict[str, Any]):
         """显示处理结果"""
@@ -248,100 +335,176 @@ class ResultView:
             
             # 更新标题
             title = result_data.get('title', '处理结果')
-            title_label = self.view['toolbar_bg']['title_label']
-            title_label.text = title
+            self._title_label.text = title
             
             # 显示文本内容
             content = result_data.get('content', '')
             if isinstance(content, dict):
                 # 如果内容是字典，格式化显示
                 formatted_content = self._format_dict_content(content)
-                self.text_view.text = formatted_content
+            elif isinstance(content, str):
+                # 已经是文本时直接显示，无需转换
+                formatted_content = content
             else:
-                self.text_view.text = str(content)
+                formatted_content = str(content)
+            
+            # 内容过长时截断，余下部分通过"显示全部"加载
+            if len(formatted_content) > _MAX_DISPLAY:
+                self._overflow_text = formatted_content[_MAX_DISPLAY:]
+                self._overflow_marker = _OVERFLOW_MARK.format(n=len(self._overflow_text))
+                formatted_content = formatted_content[:_MAX_DISPLAY] + self._overflow_marker
+                self._show_all_button.hidden = False
+            else:
+                self._clear_overflow()
+            self._set_full_text(formatted_content)
             
             # 更新按钮状态
             self._update_button_states()
             
-            logger.info(f"显示结果: {len(str(content))} 字符")
+            logger.info("显示结果: %d 字符", len(formatted_content))
         
         except Exception as e:
             logger.exception("显示结果异常")
-            self.text_view.text = f"显示结果时发生错误: {str(e)}"
+            self._set_full_text(f"显示结果时发生错误: {str(e)}")
+    
+    def _set_full_text(self, text: str, window_at_end: bool = False):
+        """设置完整文本并显示首个（或最后一个）窗口"""
+        self._full_text = text
+        self._window_dirty = False
+        length = len(text)
+        if window_at_end:
+            self._window = (max(0, length - _WINDOW_SIZE), length)
+        else:
+            self._window = (0, min(length, _WINDOW_SIZE))
+        self._refresh_window()
+    
+    def _refresh_window(self):
+        """把当前窗口的文本写入文本视图，窗口外有内容时加上省略提示"""
+        start, end = self._window
+        head = _HEAD_MARK if start > 0 else ''
+        tail = _TAIL_MARK if end < len(self._full_text) else ''
+        self._head_len = len(head)
+        self._shifting = True
+        try:
+            self.text_view.text = head + self._full_text[start:end] + tail
+        finally:
+            self._shifting = False
+        self._window_dirty = False
+    
+    def _merge_window(self):
+        """把文本视图中对当前窗口的编辑合并回完整文本"""
+        if not self._window_dirty:
+            return
+        start, end = self._window
+        edited = self.text_view.text
+        if start > 0 and edited.startswith(_HEAD_MARK):
+            edited = edited[len(_HEAD_MARK):]
+        if end < len(self._full_text) and edited.endswith(_TAIL_MARK):
+            edited = edited[:-len(_TAIL_MARK)]
+        self._full_text = self._full_text[:start] + edited + self._full_text[end:]
+        self._window = (start, start + len(edited))
+        self._window_dirty = False
+    
+    def textview_did_change(self, textview):
+        """文本视图内容被编辑"""
+        if not self._shifting:
+            self._window_dirty = True
+    
+    def textview_did_change_selection(self, textview):
+        """光标接近窗口边缘时平移窗口，每次平移半个窗口"""
+        if self._shifting:
+            return
+        try:
+            start, end = self._window
+            total = len(self._full_text)
+            if start == 0 and end >= total:
+                return
+            
+            pos = textview.selected_range[0] - self._head_len
+            step = _WINDOW_SIZE // 2
+            if pos < _WINDOW_MARGIN and start > 0:
+                shift = -min(step, start)
+            elif pos > (end - start) - _WINDOW_MARGIN and end < total:
+                shift = min(step, total - end)
+            else:
+                return
+            
+            self._merge_window()
+            start, end = self._window
+            total = len(self._full_text)
+            new_start = max(0, min(start + shift, total))
+            self._window = (new_start, min(total, new_start + _WINDOW_SIZE))
+            self._refresh_window()
+            
+            # 光标保持在原来对应的文本位置
+            cursor = max(0, min(start + pos - new_start, self._window[1] - new_start))
+            self._shifting = True
+            try:
+                textview.selected_range = (cursor + self._head_len, cursor + self._head_len)
+            finally:
+                self._shifting = False
+        
+        except Exception as e:
+            logger.error("平移文本窗口异常: %s", e)
     
     def _format_dict_content(self, content: Dict[str, Any]) -> str:
         """格式化字典内容为可读文本"""
         try:
-            formatted_lines = []
-            
-            # 处理转录结果
-            if 'transcription' in content:
-                formatted_lines.append("=== 转录结果 ===")
-                formatted_lines.append("")
-                formatted_lines.append(content['transcription'])
-                formatted_lines.append("")
-            
-            # 处理AI处理结果
-            if 'ai_processed' in content:
-                formatted_lines.append("=== AI处理结果 ===")
-                formatted_lines.append("")
-                formatted_lines.append(content['ai_processed'])
-                formatted_lines.append("")
-            
             # 处理元数据
+            metadata_block = ''
             if 'metadata' in content:
                 metadata = content['metadata']
-                formatted_lines.append("=== 处理信息 ===")
-                
-                if 'file_name' in metadata:
-                    formatted_lines.append(f"文件名: {metadata['file_name']}")
-                
-                if 'processing_time' in metadata:
-                    formatted_lines.append(f"处理时间: {metadata['processing_time']:.1f}秒")
-                
-                if 'template_used' in metadata:
-                    formatted_lines.append(f"使用模板: {metadata['template_used']}")
-                
-                if 'word_count' in metadata:
-                    formatted_lines.append(f"字数统计: {metadata['word_count']}")
-                
-                formatted_lines.append("")
+                metadata_lines = (
+                    f"文件名: {metadata['file_name']}\n" if 'file_name' in metadata else '',
+                    f"处理时间: {metadata['processing_time']:.1f}秒\n" if 'processing_time' in metadata else '',
+                    f"使用模板: {metadata['template_used']}\n" if 'template_used' in metadata else '',
+                    f"字数统计: {metadata['word_count']}\n" if 'word_count' in metadata else '',
+                )
+                metadata_block = "=== 处理信息 ===\n" + ''.join(metadata_lines)
+            
+            # 转录结果、AI处理结果、处理信息三段，各段之间空一行
+            sections = (
+                f"=== 转录结果 ===\n\n{content['transcription']}\n" if 'transcription' in content else '',
+                f"=== AI处理结果 ===\n\n{content['ai_processed']}\n" if 'ai_processed' in content else '',
+                metadata_block,
+            )
             
             # 如果没有特殊格式，直接转换为文本
-            if not formatted_lines:
-                import json
-                formatted_lines.append(json.dumps(content, ensure_ascii=False, indent=2))
+            if not any(sections):
+                return json.dumps(content, ensure_ascii=False, indent=2)
             
-            return '\n'.join(formatted_lines)
+            return '\n'.join(filter(None, sections))
         
         except Exception as e:
-            logger.error(f"格式化内容异常: {e}")
+            logger.error("格式化内容异常: %s", e)
             return str(content)
     
     def _update_button_states(self):
         """更新按钮状态"""
         try:
-            has_content = bool(self.text_view.text.strip())
+            has_content = _has_content(self.get_current_text())
+            # 只在有无内容发生变化时更新按钮（流式追加时大多数调用无需改动）
+            if has_content == self._had_content:
+                return
+            self._had_content = has_content
             
             # 根据内容是否存在启用/禁用按钮
-            button_container = self.view['action_bg']['button_container']
-            
-            for button_name in ['copy_button', 'share_button', 'save_button']:
-                if button_name in button_container.subviews:
-                    button = button_container[button_name]
-                    button.enabled = has_content
-                    button.alpha = 1.0 if has_content else 0.5
+            for button in self._action_buttons.values():
+                button.enabled = has_content
+                button.alpha = 1.0 if has_content else 0.5
         
         except Exception as e:
-            logger.error(f"更新按钮状态异常: {e}")
+            logger.error("更新按钮状态异常: %s", e)
     
     def _copy_action(self, sender):
         """复制文本操作"""
         try:
-            import clipboard
+            if clipboard is None:
+                self._show_toast('剪贴板不可用')
+                return
             
-            text_to_copy = self.text_view.text
-            if text_to_copy.strip():
+            text_to_copy = self._export_text()
+            if _has_content(text_to_copy):
                 clipboard.set(text_to_copy)
                 self._show_toast('文本已复制到剪贴板')
                 logger.info("文本已复制到剪贴板")
@@ -355,33 +518,52 @@ class ResultView:
     def _share_action(self, sender):
         """分享文本操作"""
         try:
-            text_to_share = self.text_view.text
-            if not text_to_share.strip():
+            text_to_share = self._export_text()
+            if not _has_content(text_to_share):
                 self._show_toast('没有可分享的内容')
                 return
             
             # 在iOS中分享文本
-            try:
-                import appex
-                
-                # 创建临时文件
-                temp_file = self._create_temp_file(text_to_share)
-                if temp_file:
-                    # 使用iOS分享功能
-                    import console
-                    console.open_in(temp_file)
-                    self._show_toast('已打开分享菜单')
-                else:
-                    # 备用方案：复制到剪贴板
-                    import clipboard
-                    clipboard.set(text_to_share)
-                    self._show_toast('文本已复制到剪贴板，可手动分享')
-            
-            except ImportError:
+            if appex is None:
                 # 不在iOS环境中
-                import clipboard
+                if clipboard is None:
+                    self._show_toast('剪贴板不可用')
+                    return
                 clipboard.set(text_to_share)
                 self._show_toast('文本已复制到剪贴板')
+                return
+            
+            # 临时文件在后台写入，写完后回到主线程打开分享菜单
+            threading.Thread(target=self._share_worker, args=(text_to_share,), daemon=True).start()
+        
+        except Exception as e:
+            logger.exception("分享文本异常")
+            self._show_toast(f'分享失败: {str(e)}')
+    
+    def _share_worker(self, text_to_share: str):
+        """后台创建临时文件，完成后在主线程中分享"""
+        # 内容较小时直接分享文本，不创建临时文件（share_text会阻塞，只能在后台线程调用）
+        if dialogs is not None and len(text_to_share) < _SHARE_TEXT_LIMIT:
+            try:
+                dialogs.share_text(text_to_share)
+                return
+            except Exception as e:
+                logger.warning("直接分享文本失败，改用临时文件: %s", e)
+        
+        temp_file = self._create_temp_file(text_to_share)
+        on_main_thread(self._finish_share)(temp_file, text_to_share)
+    
+    def _finish_share(self, temp_file: Optional[str], text_to_share: str):
+        """在主线程中打开分享菜单"""
+        try:
+            if temp_file:
+                # 使用iOS分享功能
+                console.open_in(temp_file)
+                self._show_toast('已打开分享菜单')
+            else:
+                # 备用方案：复制到剪贴板
+                clipboard.set(text_to_share)
+                self._show_toast('文本已复制到剪贴板，可手动分享')
         
         except Exception as e:
             logger.exception("分享文本异常")
@@ -390,27 +572,17 @@ class ResultView:
     def _save_action(self, sender):
         """保存文本操作"""
         try:
-            text_to_save = self.text_view.text
-            if not text_to_save.strip():
+            text_to_save = self._export_text()
+            if not _has_content(text_to_save):
                 self._show_toast('没有可保存的内容')
                 return
             
             # 生成文件名
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = self._timestamp()
             
             # 根据结果类型确定文件名前缀
-            file_prefix = "AI转录结果"
-            if 'metadata' in self.result_data:
-                metadata = self.result_data['metadata']
-                if 'template_used' in metadata:
-                    template_name = metadata['template_used']
-                    if template_name == 'meeting_notes':
-                        file_prefix = "会议纪要"
-                    elif template_name == 'study_notes':
-                        file_prefix = "学习笔记"
-                    elif template_name == 'content_summary':
-                        file_prefix = "内容摘要"
+            template_name = self.result_data.get('metadata', {}).get('template_used')
+            file_prefix = _FILE_PREFIXES.get(template_name, "AI转录结果")
             
             filename = f"{file_prefix}_{timestamp}.txt"
             
@@ -418,18 +590,31 @@ class ResultView:
             documents_path = os.path.expanduser('~/Documents')
             file_path = os.path.join(documents_path, filename)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(text_to_save)
-            
-            self._show_toast(f'已保存到: {filename}')
-            logger.info(f"文件已保存: {file_path}")
+            # 文件在后台写入，不阻塞界面
+            threading.Thread(target=self._save_worker, args=(file_path, filename, text_to_save),
+                             daemon=True).start()
         
         except Exception as e:
             logger.exception("保存文本异常")
             self._show_toast(f'保存失败: {str(e)}')
     
+    def _save_worker(self, file_path: str, filename: str, text_to_save: str):
+        """后台写入文件，完成后在主线程中显示提示"""
+        try:
+            _write_text_file(file_path, text_to_save)
+            
+            message = f'已保存到: {filename}'
+            logger.info("文件已保存: %s", file_path)
+        
+        except Exception as e:
+            logger.exception("保存文本异常")
+            message = f'保存失败: {str(e)}'
+        
+        on_main_thread(self._show_toast)(message)
+    
+    @ui.in_background
     def _reprocess_action(self, sender):
-        """重新处理操作"""
+        """重新处理操作（在后台执行，模板选择对话框会阻塞）"""
         try:
             # 获取原始数据
             original_text = ""
@@ -439,7 +624,7 @@ class ResultView:
                 original_text = self.result_data['content']['transcription']
             
             if not original_text:
-                self._show_toast('没有找到原始转录文本')
+                on_main_thread(self._show_toast)('没有找到原始转录文本')
                 return
             
             # 调用重新处理
@@ -447,7 +632,27 @@ class ResultView:
             
         except Exception as e:
             logger.exception("重新处理异常")
-            self._show_toast(f'重新处理失败: {str(e)}')
+            on_main_thread(self._show_toast)(f'重新处理失败: {str(e)}')
+    
+    def _show_all_action(self, sender):
+        """显示被截断的全部内容"""
+        try:
+            if not self._overflow_text:
+                return
+            
+            self._set_full_text(self._export_text())
+            self._clear_overflow()
+            self._update_button_states()
+        
+        except Exception as e:
+            logger.exception("显示全部内容异常")
+            self._show_toast(f'显示失败: {str(e)}')
+    
+    def _clear_overflow(self):
+        """丢弃截断的内容并隐藏显示全部按钮"""
+        self._overflow_text = ''
+        self._overflow_marker = ''
+        self._show_all_button.hidden = True
     
     def _close_action(self, sender):
         """关闭界面操作"""
@@ -456,109 +661,170 @@ class ResultView:
         except Exception as e:
             logger.exception("关闭界面异常")
     
+    def _timestamp(self) -> str:
+        """获取文件名使用的时间戳（1秒内复用同一个）"""
+        now = time.monotonic()
+        if now - self._ts_time >= 1.0:
+            self._ts_cached = datetime.now().strftime(_TIMESTAMP_FORMAT)
+            self._ts_time = now
+        return self._ts_cached
+    
     def _create_temp_file(self, content: str) -> Optional[str]:
         """创建临时文件"""
         try:
-            import tempfile
-            from datetime import datetime
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = self._timestamp()
             filename = f"AI转录结果_{timestamp}.txt"
             
             temp_dir = tempfile.gettempdir()
             temp_file = os.path.join(temp_dir, filename)
             
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            _write_text_file(temp_file, content)
             
             return temp_file
         
         except Exception as e:
-            logger.error(f"创建临时文件失败: {e}")
+            logger.error("创建临时文件失败: %s", e)
             return None
     
     def _show_toast(self, message: str):
         """显示提示消息"""
         try:
-            # 创建提示视图
-            toast = ui.View()
-            toast.background_color = '#333333'
-            toast.corner_radius = 10
-            toast.alpha = 0.9
-            
-            # 提示文本
-            label = ui.Label()
-            label.text = message
-            label.font = ('<system>', 14)
-            label.text_color = 'white'
-            label.alignment = ui.ALIGN_CENTER
-            label.number_of_lines = 0
+            # 提示视图只创建一次，之后重复使用
+            if self._toast_view is None:
+                toast = ui.View()
+                toast.background_color = _COLOR_TEXT
+                toast.corner_radius = 10
+                toast.alpha = 0.9
+                
+                # 提示文本
+                label = ui.Label()
+                label.font = _BUTTON_FONT
+                label.text_color = 'white'
+                label.alignment = ui.ALIGN_CENTER
+                label.number_of_lines = 0
+                toast.add_subview(label)
+                
+                self._toast_view = toast
+                self._toast_label = label
             
-            # 计算大小
-            text_size = ui.measure_string(message, font=label.font, max_width=300)
-            toast.frame = (0, 0, text_size.width + 20, text_size.height + 20)
-            label.frame = (10, 10, text_size.width, text_size.height)
+            toast = self._toast_view
+            self._toast_label.text = message
             
-            toast.add_subview(label)
+            # 计算大小
+            text_w, text_h = _measure(message, '<system>', 14, 300)
+            toast.frame = (0, 0, text_w + 20, text_h + 20)
+            self._toast_label.frame = (10, 10, text_w, text_h)
             
             # 添加到主视图并居中
-            self.view.add_subview(toast)
+            if not toast.superview:
+                self.view.add_subview(toast)
             toast.center = (self.view.width / 2, self.view.height - 100)
             
-            # 自动消失
-            import threading
-            def hide_toast():
-                import time
-                time.sleep(2)
-                if toast.superview:
-                    toast.remove_from_superview()
-            
-            threading.Thread(target=hide_toast, daemon=True).start()
+            # 自动消失（在主线程中延时执行）；新的提示会使之前的隐藏回调失效
+            self._toast_gen += 1
+            ui.delay(partial(self._hide_toast, self._toast_gen), 2.0)
         
         except Exception as e:
-            logger.error(f"显示提示消息失败: {e}")
+            logger.error("显示提示消息失败: %s", e)
             # 备用方案：使用console.hud
             try:
-                import console
                 console.hud_alert(message, duration=2)
             except:
                 print(f"提示: {message}")
     
+    def _hide_toast(self, gen: int):
+        """隐藏提示消息（期间显示了新提示则不隐藏）"""
+        toast = self._toast_view
+        if gen == self._toast_gen and toast is not None and toast.superview:
+            toast.remove_from_superview()
+    
+    def _export_text(self) -> str:
+        """获取用于复制、分享和保存的完整文本（去掉截断提示并补回被截断的内容）"""
+        text = self.get_current_text()
+        if not self._overflow_text:
+            return text
+        marker = self._overflow_marker
+        if marker:
+            pos = text.rfind(marker)
+            if pos >= 0:
+                text = text[:pos] + text[pos + len(marker):]
+        return text + self._overflow_text
+    
     def get_current_text(self) -> str:
-        """获取当前显示的文本"""
+        """获取当前的完整文本（包含对显示窗口的编辑）"""
         try:
-            return self.text_view.text
+            self._merge_window()
+            return self._full_text
         except Exception as e:
-            logger.error(f"获取当前文本失败: {e}")
+            logger.error("获取当前文本失败: %s", e)
             return ""
     
     def set_text(self, text: str):
         """设置显示文本"""
         try:
-            self.text_view.text = text
+            self._clear_overflow()
+            self._set_full_text(text)
             self._update_button_states()
         except Exception as e:
-            logger.error(f"设置文本失败: {e}")
+            logger.error("设置文本失败: %s", e)
     
     def append_text(self, text: str):
         """追加文本"""
         try:
-            current_text = self.text_view.text
-            self.text_view.text = current_text + text
+            self._merge_window()
+            if self._overflow_text:
+                # 有截断内容时追加到截断部分之后，只更新提示中的字符数
+                self._append_overflow(text)
+                return
+            
+            start, end = self._window
+            at_tail = end == len(self._full_text)
+            self._full_text += text
+            
+            if at_tail and end + len(text) - start <= _WINDOW_SIZE:
+                # 窗口已显示到末尾且追加后不超过窗口大小：只在文本视图末尾插入新内容
+                pos = self._head_len + (end - start)
+                self._window = (start, end + len(text))
+                self._shifting = True
+                try:
+                    self.text_view.replace_range((pos, pos), text)
+                finally:
+                    self._shifting = False
+            else:
+                # 否则重新显示末尾窗口
+                self._set_full_text(self._full_text, window_at_end=True)
             self._update_button_states()
             
             # 滚动到底部
-            self.text_view.selected_range = (len(self.text_view.text), 0)
+            end = self._head_len + (self._window[1] - self._window[0])
+            self._shifting = True
+            try:
+                self.text_view.selected_range = (end, end)
+            finally:
+                self._shifting = False
         except Exception as e:
-            logger.error(f"追加文本失败: {e}")
+            logger.error("追加文本失败: %s", e)
+    
+    def _append_overflow(self, text: str):
+        """把追加的文本接到被截断的内容之后，并更新截断提示"""
+        self._overflow_text += text
+        marker = _OVERFLOW_MARK.format(n=len(self._overflow_text))
+        full = self._full_text
+        pos = full.rfind(self._overflow_marker)
+        if pos >= 0:
+            full = full[:pos] + marker + full[pos + len(self._overflow_marker):]
+        self._overflow_marker = marker
+        self._set_full_text(full, window_at_end=True)
+        self._update_button_states()
     
     def clear_text(self):
         """清空文本"""
         try:
-            self.text_view.text = ""
+            self._clear_overflow()
+            self._set_full_text('')
             self._update_button_states()
         except Exception as e:
-            logger.error(f"清空文本失败: {e}")
+            logger.error("清空文本失败: %s", e)
     
     def show(self):
         """显示结果界面"""
@@ -575,12 +841,12 @@ class ResultView:
             elif self.view.superview:
                 self.view.remove_from_superview()
         except Exception as e:
-            logger.error(f"隐藏结果界面异常: {e}")
+            logger.error("隐藏结果界面异常: %s", e)
     
     def is_visible(self) -> bool:
         """检查界面是否可见"""
         try:
             return bool(self.view.superview) or bool(getattr(self.view, 'on_screen', False))
         except Exception as e:
-            logger.error(f"检查界面可见性异常: {e}")
+            logger.error("检查界面可见性异常: %s", e)
             return False
\ No newline at end of file
@@ -5,12 +5,101 @@
 """
 
 import ui
+import os
 from typing import Optional, Dict, Any, List
 from ..utils.logger import get_logger
 from ..config import config
 
 logger = get_logger(__name__)
 
+# console只在Pythonista中可用，模块加载时导入一次
+try:
+    import console
+except ImportError:
+    console = None
+
+# 屏幕尺寸缓存，由SettingsView._get_screen_size填充，所有设置界面共用；布局变化时清空
+_SCREEN_SIZE_CACHE = None
+
+# API密钥显示时用于遮挡的字符，按需切片
+_MASK = '*' * 128
+
+# 静态提示文本
+_HELP_TEXT = '''使用说明：
+
+1. 配置API密钥
+   - 设置硅基流动API密钥用于语音转文字
+   - 设置DeepSeek API密钥用于AI文本处理
+
+2. 添加音视频文件
+   - 点击"添加文件"按钮
+   - 通过分享扩展从其他应用分享文件
+   - 支持多种音视频格式
+
+3. 选择处理模板
+   - 会议纪要：整理会议内容
+   - 学习笔记：整理学习材料
+   - 内容摘要：生成内容摘要
+   - 自定义：使用自定义模板
+
+4. 开始处理
+   - 单独转录：仅进行语音转文字
+   - AI整理：对已有文本进行AI处理
+   - 一键处理：转录+AI整理完整流程
+
+常见问题请查看应用文档。'''
+
+_FEEDBACK_TEXT = '''反馈渠道：
+
+如果您在使用过程中遇到问题或有改进建议，欢迎通过以下方式反馈：
+
+• 应用内反馈
+• GitHub Issues
+• 邮件反馈
+
+您的反馈对我们改进产品非常重要！'''
+
+_DATA_MGMT_TEXT = '''数据管理：
+
+• 清理缓存：删除所有转录和处理缓存
+• 清理日志：删除应用日志文件
+• 清理临时文件：删除处理过程中的临时文件
+• 重置设置：恢复应用默认设置
+
+注意：这些操作不可撤销，请谨慎操作！'''
+
+# 关于信息模板，版本号在首次显示时填入
+_ABOUT_TEMPLATE = '''AI音视频转文字工具
+
+版本: {version}
+作者: AI Transcribe Team
+
+功能特性:
+• 支持多种音视频格式
+• 高精度语音识别
+• AI智能文本整理
+• 丰富的处理模板
+• iOS原生集成
+
+技术支持:
+• 硅基流动API - 语音转文字
+• DeepSeek API - AI文本处理
+• Pythonista UI框架
+
+感谢您的使用！'''
+
+class _SettingsRootView(ui.View):
+    """设置界面根视图，尺寸变化时通知SettingsView重新布局"""
+    
+    on_layout = None
+    
+    def layout(self):
+        # 旋转或分屏改变了尺寸，下次获取屏幕尺寸时重新计算
+        global _SCREEN_SIZE_CACHE
+        _SCREEN_SIZE_CACHE = None
+        if self.on_layout:
+            self.on_layout(self.width, self.height)
+
 class SettingsView:
     """设置界面类"""
     
@@ -18,14 +107,27 @@ class SettingsView:
         self.app_controller = app_controller
         self.view = None
         self.section_table = None
-        
-        self._create_ui()
+        # 界面在第一次显示时才创建
+    
+    def _ensure_ui(self):
+        """确保界面已创建"""
+        if self.view is not None:
+            return
+        try:
+            self._create_ui()
+        except Exception:
+            # 创建失败时丢弃不完整的界面，下次显示时重试
+            self.view = None
+            raise
     
     def _get_screen_size(self):
-        """获取屏幕尺寸"""
+        """获取屏幕尺寸（缓存到下次布局变化）"""
+        global _SCREEN_SIZE_CACHE
+        if _SCREEN_SIZE_CACHE is not None:
+            return _SCREEN_SIZE_CACHE
+        
         try:
             # 尝试获取实际屏幕尺寸
-            import console
             if hasattr(console, 'get_window_size'):
                 console_size = console.get_window_size()
                 width = max(375, console_size[0] * 10)
@@ -33,8 +135,9 @@ class SettingsView:
             else:
                 width, height = 375, 667
                 
-            logger.debug(f"屏幕尺寸: {width}x{height}")
-            return width, height
+            logger.debug("屏幕尺寸: %sx%s", width, height)
+            _SCREEN_SIZE_CACHE = (width, height)
+            return _SCREEN_SIZE_CACHE
             
         except Exception as e:
             logger.warning(f"获取屏幕尺寸失败，使用默认值: {e}")
@@ -47,7 +150,7 @@ class SettingsView:
             self.screen_width, self.screen_height = self._get_screen_size()
             
             # 主视图
-            self.view = ui.View(name='设置')
+            self.view = _SettingsRootView(name='设置')
             self.view.background_color = '#f0f0f0'
             self.view.frame = (0, 0, self.screen_width, self.screen_height)
             
@@ -57,6 +160,11 @@ class SettingsView:
             # 设置内容
             self._create_settings_content()
             
+            # 首次布局；之后尺寸变化（如旋转）时由layout回调只更新frame
+            self._layout_size = None
+            self._relayout(self.screen_width, self.screen_height)
+            self.view.on_layout = self._relayout
+            
             logger.info("设置界面创建完成")
         
         except Exception as e:
@@ -64,59 +172,59 @@ class SettingsView:
             raise
     
     def _create_title_bar(self):
-        """创建标题栏"""
-        title_height = max(60, int(self.screen_height * 0.08))
-        
+        """创建标题栏（只创建视图，尺寸由_relayout设置）"""
         # 标题栏背景
-        title_bg = ui.View(name='title_bg')
-        title_bg.background_color = '#ffffff'
-        title_bg.frame = (0, 0, self.screen_width, title_height)
-        title_bg.flex = 'W'
-        self.view.add_subview(title_bg)
+        self._title_bg = ui.View(name='title_bg')
+        self._title_bg.background_color = '#ffffff'
+        self.view.add_subview(self._title_bg)
         
         # 标题
-        title_label = ui.Label(name='title_label')
-        title_label.text = '设置'
-        title_label.font = ('<system-bold>', max(16, int(self.screen_width / 20)))
-        title_label.text_color = '#333333'
-        title_label.frame = (20, (title_height - 30) // 2, 200, 30)
-        title_bg.add_subview(title_label)
+        self._title_label = ui.Label(name='title_label')
+        self._title_label.text = '设置'
+        self._title_label.text_color = '#333333'
+        self._title_bg.add_subview(self._title_label)
         
         # 完成按钮
-        button_width = max(50, int(self.screen_width / 7))
-        done_button = ui.Button(name='done_button')
-        done_button.title = '完成'
-        done_button.font = ('<system>', max(14, int(self.screen_width / 26)))
-        done_button.text_color = '#007AFF'
-        done_button.frame = (self.screen_width - button_width - 10, 
-                           (title_height - 30) // 2, 
-                           button_width, 30)
-        done_button.flex = 'L'
-        done_button.action = self._done_action
-        title_bg.add_subview(done_button)
+        self._done_button = ui.Button(name='done_button')
+        self._done_button.title = '完成'
+        self._done_button.text_color = '#007AFF'
+        self._done_button.action = self._done_action
+        self._title_bg.add_subview(self._done_button)
         
         # 分隔线
-        separator = ui.View(name='separator')
-        separator.background_color = '#e0e0e0'
-        separator.frame = (0, title_height - 1, self.screen_width, 1)
-        separator.flex = 'W'
-        self.view.add_subview(separator)
-        
-        # 保存标题栏高度
-        self._title_height = title_height
+        self._separator = ui.View(name='separator')
+        self._separator.background_color = '#e0e0e0'
+        self.view.add_subview(self._separator)
     
     def _create_settings_content(self):
         """创建设置内容"""
         # 使用表格视图显示设置选项
         self.section_table = ui.TableView(name='section_table')
-        self.section_table.frame = (0, self._title_height, 
-                                  self.screen_width, 
-                                  self.screen_height - self._title_height)
-        self.section_table.flex = 'WH'
         self.section_table.data_source = SettingsDataSource(self)
         self.section_table.delegate = SettingsDelegate(self)
         self.view.add_subview(self.section_table)
     
+    def _relayout(self, width, height):
+        """按给定尺寸更新已有视图的位置和字体，不创建新视图"""
+        if self._layout_size == (width, height):
+            return
+        self._layout_size = (width, height)
+        
+        title_height = max(60, int(height * 0.08))
+        self._title_bg.frame = (0, 0, width, title_height)
+        
+        self._title_label.font = ('<system-bold>', max(16, int(width / 20)))
+        self._title_label.frame = (20, (title_height - 30) // 2, 200, 30)
+        
+        button_width = max(50, int(width / 7))
+        self._done_button.font = ('<system>', max(14, int(width / 26)))
+        self._done_button.frame = (width - button_width - 10,
+                                   (title_height - 30) // 2,
+                                   button_width, 30)
+        
+        self._separator.frame = (0, title_height - 1, width, 1)
+        self.section_table.frame = (0, title_height, width, height - title_height)
+    
     def _done_action(self, sender):
         """完成操作"""
         try:
@@ -159,6 +267,7 @@ class SettingsView:
     def show(self):
         """显示设置界面"""
         try:
+            self._ensure_ui()
             self.view.present('sheet', hide_title_bar=True)
         except Exception as e:
             logger.exception("显示设置界面异常")
@@ -166,6 +275,8 @@ class SettingsView:
     def hide(self):
         """隐藏设置界面"""
         try:
+            if self.view is None:
+                return
             if hasattr(self.view, 'close'):
                 self.view.close()
             elif self.view.superview:
@@ -212,6 +323,15 @@ class SettingsDataSource:
                 ]
             }
         ]
+        # 设置项是固定的，单元格按(section, row)缓存复用；同时记录单元格当前显示的API状态
+        self._cell_pool = {}
+        self._cell_status = {}
+        # 状态图标只加载一次
+        self._img_ok = ui.Image.named('iob:checkmark_circled_32')
+        self._img_err = ui.Image.named('iob:close_circled_32')
+        self._img_unknown = ui.Image.named('iob:help_circled_32')
+        # API状态缓存，只在API密钥写入后按服务失效
+        self._api_status_cache = {}
     
     def tableview_number_of_sections(self, tableview):
         return len(self.sections)
@@ -225,21 +345,28 @@ class SettingsDataSource:
     def tableview_cell_for_row(self, tableview, section, row):
         try:
             item = self.sections[section]['items'][row]
+            key = (section, row)
             
-            cell = ui.TableViewCell('subtitle')
-            cell.text_label.text = item['title']
-            cell.detail_text_label.text = item['subtitle']
-            cell.accessory_type = 'disclosure_indicator'
+            cell = self._cell_pool.get(key)
+            if cell is None:
+                cell = ui.TableViewCell('subtitle')
+                cell.text_label.text = item['title']
+                cell.detail_text_label.text = item['subtitle']
+                cell.accessory_type = 'disclosure_indicator'
+                self._cell_pool[key] = cell
             
-            # 添加状态指示
+            # 添加状态指示（状态未变化时不重复设置图标）
             if item['action'].startswith('api_'):
                 status = self._get_api_status(item['action'])
+                if self._cell_status.get(key) == status:
+                    return cell
+                self._cell_status[key] = status
                 if status == 'configured':
-                    cell.image_view.image = ui.Image.named('iob:checkmark_circled_32')
+                    cell.image_view.image = self._img_ok
                 elif status == 'error':
-                    cell.image_view.image = ui.Image.named('iob:close_circled_32')
+                    cell.image_view.image = self._img_err
                 else:
-                    cell.image_view.image = ui.Image.named('iob:help_circled_32')
+                    cell.image_view.image = self._img_unknown
             
             return cell
         except Exception as e:
@@ -248,8 +375,22 @@ class SettingsDataSource:
             cell.text_label.text = "错误"
             return cell
     
+    def invalidate_api_status(self, service: str):
+        """API密钥变化后使对应服务的状态缓存失效"""
+        self._api_status_cache.pop(f'api_{service}', None)
+    
     def _get_api_status(self, action: str) -> str:
-        """获取API配置状态"""
+        """获取API配置状态（带缓存）"""
+        status = self._api_status_cache.get(action)
+        if status is None:
+            status = self._load_api_status(action)
+            # 读取失败（如钥匙串暂时不可用）不缓存，下次刷新时重新读取
+            if status in ('configured', 'not_configured'):
+                self._api_status_cache[action] = status
+        return status
+    
+    def _load_api_status(self, action: str) -> str:
+        """读取API配置状态"""
         try:
             if action == 'api_siliconflow':
                 api_key = config.get_api_key('siliconflow')
@@ -268,37 +409,36 @@ class SettingsDelegate:
     
     def __init__(self, settings_view):
         self.settings_view = settings_view
+        # action到处理函数的映射，只构建一次
+        self._dispatch = {
+            'api_siliconflow': self._show_siliconflow_settings,
+            'api_deepseek': self._show_deepseek_settings,
+            'api_test': self._test_apis,
+            'templates': settings_view.show_template_settings,
+            'formats': self._show_format_settings,
+            'cache': self._show_cache_settings,
+            'general': settings_view.show_general_settings,
+            'logs': self._show_log_settings,
+            'data': self._show_data_management,
+            'about': settings_view.show_about,
+            'help': self._show_help,
+            'feedback': self._show_feedback,
+        }
+        # API密钥缓存，服务名 -> 密钥
+        self._api_key_cache = {}
+        # 日志统计缓存: (目录修改时间, 文件数, 总大小)
+        self._log_stats = None
     
     def tableview_did_select(self, tableview, section, row):
+        action = None
         try:
             item = self.settings_view.section_table.data_source.sections[section]['items'][row]
             action = item['action']
             
             # 根据action执行相应操作
-            if action == 'api_siliconflow':
-                self._show_siliconflow_settings()
-            elif action == 'api_deepseek':
-                self._show_deepseek_settings()
-            elif action == 'api_test':
-                self._test_apis()
-            elif action == 'templates':
-                self.settings_view.show_template_settings()
-            elif action == 'formats':
-                self._show_format_settings()
-            elif action == 'cache':
-                self._show_cache_settings()
-            elif action == 'general':
-                self.settings_view.show_general_settings()
-            elif action == 'logs':
-                self._show_log_settings()
-            elif action == 'data':
-                self._show_data_management()
-            elif action == 'about':
-                self.settings_view.show_about()
-            elif action == 'help':
-                self._show_help()
-            elif action == 'feedback':
-                self._show_feedback()
+            handler = self._dispatch.get(action)
+            if handler:
+                handler()
             
             # 取消选中状态
             tableview.selected_row = (-1, -1)
@@ -306,10 +446,18 @@ class SettingsDelegate:
         except Exception as e:
             logger.exception(f"处理设置选择异常: {action}")
     
+    def _get_api_key(self, service: str) -> str:
+        """获取API密钥，按服务缓存，设置或删除时失效"""
+        key = self._api_key_cache.get(service)
+        if key is None:
+            key = config.get_api_key(service) or ''
+            self._api_key_cache[service] = key
+        return key
+    
     def _show_siliconflow_settings(self):
         """显示硅基流动API设置"""
         try:
-            current_key = config.get_api_key('siliconflow') or ''
+            current_key = self._get_api_key('siliconflow')
             
             # 创建输入对话框
             key_input = self._create_api_key_input(
@@ -324,7 +472,7 @@ class SettingsDelegate:
     def _show_deepseek_settings(self):
         """显示DeepSeekAPI设置"""
         try:
-            current_key = config.get_api_key('deepseek') or ''
+            current_key = self._get_api_key('deepseek')
             
             # 创建输入对话框
             key_input = self._create_api_key_input(
@@ -339,11 +487,9 @@ class SettingsDelegate:
     def _create_api_key_input(self, title: str, message: str, current_value: str, service: str):
         """创建API密钥输入对话框"""
         try:
-            import console
-            
             # 显示当前值（部分隐藏）
             if current_value:
-                masked_value = current_value[:8] + '*' * (len(current_value) - 8)
+                masked_value = current_value[:8] + _MASK[:max(0, len(current_value) - 8)]
                 message += f'\n\n当前值: {masked_value}'
             
             # 获取新的API密钥
@@ -372,6 +518,8 @@ class SettingsDelegate:
             
             # 保存API密钥
             success = config.set_api_key(service, api_key)
+            self._api_key_cache.pop(service, None)
+            self.settings_view.section_table.data_source.invalidate_api_status(service)
             if success:
                 logger.info(f"{service} API密钥设置成功")
             
@@ -384,8 +532,6 @@ class SettingsDelegate:
     def _test_apis(self):
         """测试API连接"""
         try:
-            import console
-            
             results = []
             
             # 测试硅基流动API
@@ -424,8 +570,6 @@ class SettingsDelegate:
     def _show_format_settings(self):
         """显示格式设置"""
         try:
-            import console
-            
             supported_formats = config.get('supported_formats', {})
             audio_formats = supported_formats.get('audio', [])
             video_formats = supported_formats.get('video', [])
@@ -448,8 +592,6 @@ class SettingsDelegate:
     def _show_cache_settings(self):
         """显示缓存设置"""
         try:
-            import console
-            
             from ..utils.cache import cache
             cache_info = cache.get_cache_size()
             
@@ -475,19 +617,8 @@ class SettingsDelegate:
     def _show_log_settings(self):
         """显示日志设置"""
         try:
-            import console
-            import os
-            
             log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
-            log_count = 0
-            log_size = 0
-            
-            if os.path.exists(log_dir):
-                for filename in os.listdir(log_dir):
-                    if filename.endswith('.log'):
-                        log_count += 1
-                        log_path = os.path.join(log_dir, filename)
-                        log_size += os.path.getsize(log_path)
+            log_count, log_size = self._get_log_stats(log_dir)
             
             log_text = f'''日志信息：
 
@@ -502,19 +633,34 @@ class SettingsDelegate:
         except Exception as e:
             logger.exception("显示日志设置异常")
     
+    def _get_log_stats(self, log_dir: str):
+        """统计日志文件数量和大小，结果按目录修改时间缓存"""
+        try:
+            dir_mtime = os.stat(log_dir).st_mtime_ns
+        except OSError:
+            return 0, 0
+        
+        # 目录未变化（没有新增或删除日志文件）时直接复用上次的统计结果
+        if self._log_stats is not None and self._log_stats[0] == dir_mtime:
+            return self._log_stats[1], self._log_stats[2]
+        
+        log_count = 0
+        log_size = 0
+        with os.scandir(log_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.log') and entry.is_file():
+                    try:
+                        log_size += entry.stat().st_size
+                    except OSError:
+                        continue
+                    log_count += 1
+        self._log_stats = (dir_mtime, log_count, log_size)
+        return log_count, log_size
+    
     def _show_data_management(self):
         """显示数据管理"""
         try:
-            import console
-            
-            data_text = '''数据管理：
-
-• 清理缓存：删除所有转录和处理缓存
-• 清理日志：删除应用日志文件
-• 清理临时文件：删除处理过程中的临时文件
-• 重置设置：恢复应用默认设置
-
-注意：这些操作不可撤销，请谨慎操作！'''
+            data_text = _DATA_MGMT_TEXT
             
             options = ['清理缓存', '清理日志', '清理临时文件', '重置设置', '取消']
             result = console.alert('数据管理', data_text, *options)
@@ -536,7 +682,6 @@ class SettingsDelegate:
         try:
             from ..utils.cache import cache
             if cache.clear():
-                import console
                 console.hud_alert('缓存已清理', 'success', 2)
             else:
                 console.hud_alert('清理缓存失败', 'error', 2)
@@ -546,15 +691,20 @@ class SettingsDelegate:
     def _clear_logs(self):
         """清理日志"""
         try:
-            import os
-            import shutil
-            
             log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
-            if os.path.exists(log_dir):
-                shutil.rmtree(log_dir)
-                os.makedirs(log_dir, exist_ok=True)
+            # 只删除日志文件，保留目录本身，避免正在写日志的处理器找不到目录
+            try:
+                with os.scandir(log_dir) as it:
+                    for entry in it:
+                        if entry.name.endswith('.log') and entry.is_file():
+                            try:
+                                os.unlink(entry.path)
+                            except OSError as e:
+                                logger.warning(f"删除日志文件失败: {entry.name} - {e}")
+            except FileNotFoundError:
+                pass
+            self._log_stats = None
             
-            import console
             console.hud_alert('日志已清理', 'success', 2)
         except Exception as e:
             logger.exception("清理日志异常")
@@ -565,7 +715,6 @@ class SettingsDelegate:
             from ..utils.file_utils import FileUtils
             cleaned_count = FileUtils.cleanup_temp_files()
             
-            import console
             console.hud_alert(f'已清理 {cleaned_count} 个临时文件', 'success', 2)
         except Exception as e:
             logger.exception("清理临时文件异常")
@@ -573,14 +722,15 @@ class SettingsDelegate:
     def _reset_settings(self):
         """重置设置"""
         try:
-            import console
-            
             # 确认操作
             result = console.alert('重置设置', '确定要重置所有设置吗？这将删除所有API密钥和自定义配置。', '确定', '取消')
             if result == 1:
                 # 删除API密钥
-                config.delete_api_key('siliconflow')
-                config.delete_api_key('deepseek')
+                data_source = self.settings_view.section_table.data_source
+                for service in ('siliconflow', 'deepseek'):
+                    config.delete_api_key(service)
+                    self._api_key_cache.pop(service, None)
+                    data_source.invalidate_api_status(service)
                 
                 # 重新加载默认配置
                 # 这里需要重新初始化配置对象
@@ -594,31 +744,7 @@ class SettingsDelegate:
     def _show_help(self):
         """显示帮助信息"""
         try:
-            import console
-            
-            help_text = '''使用说明：
-
-1. 配置API密钥
-   - 设置硅基流动API密钥用于语音转文字
-   - 设置DeepSeek API密钥用于AI文本处理
-
-2. 添加音视频文件
-   - 点击"添加文件"按钮
-   - 通过分享扩展从其他应用分享文件
-   - 支持多种音视频格式
-
-3. 选择处理模板
-   - 会议纪要：整理会议内容
-   - 学习笔记：整理学习材料
-   - 内容摘要：生成内容摘要
-   - 自定义：使用自定义模板
-
-4. 开始处理
-   - 单独转录：仅进行语音转文字
-   - AI整理：对已有文本进行AI处理
-   - 一键处理：转录+AI整理完整流程
-
-常见问题请查看应用文档。'''
+            help_text = _HELP_TEXT
             
             console.alert('使用帮助', help_text, 'OK', hide_cancel_button=True)
         except Exception as e:
@@ -627,17 +753,7 @@ class SettingsDelegate:
     def _show_feedback(self):
         """显示反馈信息"""
         try:
-            import console
-            
-            feedback_text = '''反馈渠道：
-
-如果您在使用过程中遇到问题或有改进建议，欢迎通过以下方式反馈：
-
-• 应用内反馈
-• GitHub Issues
-• 邮件反馈
-
-您的反馈对我们改进产品非常重要！'''
+            feedback_text = _FEEDBACK_TEXT
             
             console.alert('反馈建议', feedback_text, 'OK', hide_cancel_button=True)
         except Exception as e:
@@ -676,31 +792,22 @@ class GeneralSettingsView:
 class AboutView:
     """关于界面"""
     
+    # 格式化后的关于信息，所有实例共用
+    _cached_text = None
+    
     def __init__(self):
         pass
     
+    @classmethod
+    def _about_text(cls) -> str:
+        """获取关于信息文本（只格式化一次）"""
+        if cls._cached_text is None:
+            cls._cached_text = _ABOUT_TEMPLATE.format(version=config.get('version', '1.0.0'))
+        return cls._cached_text
+    
     def show(self):
         try:
-            import console
-            
-            about_text = f'''AI音视频转文字工具
-
-版本: {config.get('version', '1.0.0')}
-作者: AI Transcribe Team
-
-功能特性:
-• 支持多种音视频格式
-• 高精度语音识别
-• AI智能文本整理
-• 丰富的处理模板
-• iOS原生集成
-
-技术支持:
-• 硅基流动API - 语音转文字
-• DeepSeek API - AI文本处理
-• Pythonista UI框架
-
-感谢您的使用！'''
+            about_text = self._about_text()
             
             console.alert('关于', about_text, 'OK', hide_cancel_button=True)
         except Exception as e:
@@ -5,13 +5,90 @@ API工具模块
 """
 
 import json
+import re
+import socket
+import threading
 import time
+from functools import lru_cache
+from email.utils import parsedate_to_datetime
 from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
 import requests
+from requests.adapters import HTTPAdapter
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# 优先使用orjson解析响应（Pythonista中没有，回退到标准库json）
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# 共享的HTTP会话，复用TCP/TLS连接；重试由make_request自行处理
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+
+# 各服务API密钥格式：sk-开头且总长度大于20
+_SK_KEY_MATCH = re.compile(r'sk-.{18,}', re.DOTALL).fullmatch
+_KEY_VALIDATORS = {
+    'siliconflow': _SK_KEY_MATCH,
+    'deepseek': _SK_KEY_MATCH,
+}
+
+# 网络检测：解析实际要访问的API服务器域名，等待有上限；只缓存成功结果，按域名记录
+_NETWORK_PROBE_HOST = 'api.siliconflow.cn'
+_NETWORK_CHECK_TIMEOUT = 2.0
+_NETWORK_CHECK_TTL = 10.0
+_network_ok: Dict[str, float] = {}
+
+def _resolves(host: str, timeout: float) -> bool:
+    """在后台线程中解析域名，超时视为不可用（解析本身没有超时参数）"""
+    result = []
+    
+    def worker():
+        try:
+            result.append(bool(socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)))
+        except OSError:
+            result.append(False)
+    
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return bool(result) and result[0]
+
+# 重试等待时间上限（秒），同时用于限制服务器给出的Retry-After
+_MAX_RETRY_DELAY = 30.0
+
+# 分块时优先在这些句末符号处断开
+_SENTENCE_ENDS = '.!?。！？'
+
+# 估算token时按字计数的中文字符
+_CJK_RE = re.compile('[\u4e00-\u9fff]')
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析Retry-After头部（秒数或HTTP日期），无法解析时返回None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+def _estimate_tokens(text: str) -> int:
+    """估算token数量：中文字符和英文单词各按1个token计算"""
+    # subn一次扫描同时去掉中文字符并得到其数量，剩余部分按空白分词
+    non_chinese, chinese_chars = _CJK_RE.subn('', text)
+    return chinese_chars + len(non_chinese.split())
+
+# 重试等场景会反复估算同一段文本，较短的文本缓存结果
+_estimate_tokens_cached = lru_cache(maxsize=256)(_estimate_tokens)
+_TOKEN_CACHE_MAX_LEN = 64 * 1024
+
 class APIUtils:
     """API工具类"""
     
@@ -41,11 +118,12 @@ class APIUtils:
             headers['User-Agent'] = 'AI-Transcribe/1.0.0'
         
         for attempt in range(max_retries):
+            retry_after = None
             try:
                 logger.debug(f"API请求: {method} {url} (尝试 {attempt + 1}/{max_retries})")
                 
                 # 发送请求
-                response = requests.request(
+                response = _session.request(
                     method=method.upper(),
                     url=url,
                     headers=headers,
@@ -58,7 +136,7 @@ class APIUtils:
                 # 检查状态码
                 if response.status_code == 200:
                     try:
-                        result = response.json()
+                        result = _json_loads(response.content)
                         logger.debug(f"API请求成功: {method} {url}")
                         return True, result, None
                     except json.JSONDecodeError:
@@ -68,13 +146,14 @@ class APIUtils:
                     error_msg = f"HTTP {response.status_code}: {response.text}"
                     logger.warning(f"API请求失败: {error_msg}")
                     
-                    # 对于客户端错误（4xx），不重试
-                    if 400 <= response.status_code < 500:
+                    # 对于客户端错误（4xx），除限流（429）外不重试
+                    if 400 <= response.status_code < 500 and response.status_code != 429:
                         return False, None, error_msg
                     
-                    # 服务器错误（5xx）可以重试
+                    # 服务器错误（5xx）和限流可以重试
                     if attempt == max_retries - 1:
                         return False, None, error_msg
+                    retry_after = _parse_retry_after(response.headers.get('Retry-After'))
             
             except requests.exceptions.Timeout:
                 error_msg = f"请求超时 ({timeout}s)"
@@ -96,7 +175,9 @@ class APIUtils:
             
             # 重试延迟
             if attempt < max_retries - 1:
-                time.sleep(retry_delay * (2 ** attempt))  # 指数退避
+                if retry_after is None:
+                    retry_after = retry_delay * (2 ** attempt)  # 指数退避
+                time.sleep(min(retry_after, _MAX_RETRY_DELAY))
         
         return False, None, "请求失败"
     
@@ -109,12 +190,9 @@ class APIUtils:
         # 移除首尾空格
         api_key = api_key.strip()
         
-        if service == 'siliconflow':
-            # 硅基流动API密钥格式验证
-            return len(api_key) > 20 and api_key.startswith('sk-')
-        elif service == 'deepseek':
-            # DeepSeek API密钥格式验证
-            return len(api_key) > 20 and api_key.startswith('sk-')
+        validator = _KEY_VALIDATORS.get(service)
+        if validator:
+            return validator(api_key) is not None
         
         # 默认基本验证
         return len(api_key) > 10
@@ -148,11 +226,11 @@ class APIUtils:
                 chunks.append(text[start:])
                 break
             
-            # 尝试在句号、问号、感叹号处分割
-            for i in range(end, start + max_length - overlap, -1):
-                if text[i] in '.!?。！？':
-                    end = i + 1
-                    break
+            # 尝试在句号、问号、感叹号处分割（在C层用rfind查找窗口内最后一个句末符号）
+            window_start = start + max_length - overlap + 1
+            boundary = max(text.rfind(c, window_start, end + 1) for c in _SENTENCE_ENDS)
+            if boundary >= 0:
+                end = boundary + 1
             
             chunks.append(text[start:end])
             start = end - overlap  # 保持重叠以避免语义断裂
@@ -162,11 +240,10 @@ class APIUtils:
     @staticmethod
     def estimate_tokens(text: str) -> int:
         """估算文本的token数量（粗略估算）"""
-        # 中文字符按1个token计算，英文单词按1个token计算
-        chinese_chars = len([c for c in text if '\u4e00' <= c <= '\u9fff'])
-        english_words = len(text.replace(''.join([c for c in text if '\u4e00' <= c <= '\u9fff']), '').split())
-        
-        return chinese_chars + english_words
+        # 过长的文本不进缓存，避免缓存占用大量内存
+        if len(text) > _TOKEN_CACHE_MAX_LEN:
+            return _estimate_tokens(text)
+        return _estimate_tokens_cached(text)
     
     @staticmethod
     def format_error_message(error: str, context: str = '') -> str:
@@ -176,10 +253,16 @@ class APIUtils:
         return error
     
     @staticmethod
-    def is_network_available() -> bool:
-        """检查网络连接是否可用"""
-        try:
-            response = requests.get('https://httpbin.org/status/200', timeout=5)
-            return response.status_code == 200
-        except:
-            return False
\ No newline at end of file
+    def is_network_available(url: Optional[str] = None) -> bool:
+        """检查能否解析API服务器域名（url为空时检查硅基流动；成功结果缓存10秒）"""
+        host = (urlsplit(url).hostname if url else None) or _NETWORK_PROBE_HOST
+        now = time.monotonic()
+        checked_at = _network_ok.get(host)
+        if checked_at is not None and now - checked_at < _NETWORK_CHECK_TTL:
+            return True
+        
+        # 失败结果不缓存，网络恢复后下一次检查即可成功
+        if _resolves(host, _NETWORK_CHECK_TIMEOUT):
+            _network_ok[host] = now
+            return True
+        return False
@@ -5,24 +5,114 @@
 """
 
 import os
-import json
 import hashlib
+import json
+import logging
+import mmap
+import struct
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Any, Optional, Dict
 from ..config import config
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# 有orjson时优先用它序列化（Pythonista中没有，使用标准库json）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 缓存文件格式：文件头（魔数、负载格式、时间戳）+ 负载
+_MAGIC = b'ATC1'
+_HEADER = struct.Struct('<4sBd')
+_FORMAT_JSON = 1
+
+# 写缓存文件时的缓冲区大小，大的转录文本可以少做几次系统调用
+_WRITE_BUFFER_SIZE = 1 << 20
+# 超过该大小的缓存文件读取时使用mmap（仅orjson可直接从映射解析，标准库json仍需整体解码）
+_MMAP_THRESHOLD = 256 * 1024
+# 清空缓存时并发删除文件的线程数
+_REMOVE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+def _dumps_json(payload: Dict[str, Any]) -> Optional[bytes]:
+    """把缓存数据序列化为JSON，含JSON无法表示的对象时返回None"""
+    try:
+        if orjson is not None:
+            return orjson.dumps(payload)
+        return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    except (TypeError, ValueError):
+        return None
+
+def _dump(timestamp: float, body: bytes, f):
+    """把文件头和JSON负载写入文件对象"""
+    f.write(_HEADER.pack(_MAGIC, _FORMAT_JSON, timestamp))
+    f.write(body)
+
+def _deserialize(data) -> Dict[str, Any]:
+    """从二进制（bytes或mmap）解析缓存数据"""
+    magic, fmt, timestamp = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError('缓存文件格式无效')
+    with memoryview(data) as view:
+        cache_data = _loads_body(fmt, view[_HEADER.size:])
+    cache_data['timestamp'] = timestamp
+    return cache_data
+
+def _loads_body(fmt: int, body) -> Dict[str, Any]:
+    """按负载格式解析文件头之后的内容"""
+    if fmt == _FORMAT_JSON:
+        if orjson is not None:
+            return orjson.loads(body)
+        # 直接从缓冲区解码，不再额外复制一份bytes
+        return json.loads(str(body, 'utf-8'))
+    raise ValueError(f'不支持的缓存负载格式: {fmt}')
+
+def _load_file(file_path: str) -> Dict[str, Any]:
+    """读取缓存文件，有orjson时较大的文件通过mmap直接解析，不先整体读入内存"""
+    with open(file_path, 'rb') as f:
+        if orjson is None or os.fstat(f.fileno()).st_size < _MMAP_THRESHOLD:
+            return _deserialize(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _deserialize(mm)
+
+def _read_timestamp(file_path: str) -> float:
+    """只读取文件头中的时间戳"""
+    with open(file_path, 'rb') as f:
+        magic, _, timestamp = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != _MAGIC:
+        raise ValueError('缓存文件格式无效')
+    return timestamp
+
+@lru_cache(maxsize=4096)
+def _hash_key(key: str) -> str:
+    """计算缓存键的哈希值（32位十六进制，与原MD5文件名长度一致）"""
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
 class Cache:
     """缓存管理器"""
     
     def __init__(self):
         self.cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache')
-        self.memory_cache: Dict[str, Dict[str, Any]] = {}
+        # 内存缓存按最近使用顺序排列，超过上限时淘汰最久未用的条目
+        self.memory_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        # 转录和文本处理在工作线程中使用缓存，内存缓存的读写都需要加锁
+        self._memory_lock = threading.Lock()
         self.enabled = config.get('cache.enabled', True)
         self.max_size_mb = config.get('cache.max_size_mb', 500)
         self.ttl_hours = config.get('cache.ttl_hours', 24)
+        self._ttl_seconds = self.ttl_hours * 3600
+        self.memory_max_items = config.get('cache.memory_max_items', 128)
+        # 缓存文件的(总大小, 文件数)，文件增删时置为None，下次查询时重新统计
+        self._disk_usage = None
+        # 磁盘上存在的缓存文件键（文件名哈希），未命中时不必访问文件系统
+        self._known_keys = set()
+        # 目录扫描是否完整；扫描失败时_known_keys不可信，需回退到检查磁盘文件
+        self._known_keys_complete = False
         
         if self.enabled:
             os.makedirs(self.cache_dir, exist_ok=True)
@@ -30,67 +120,113 @@ class Cache:
     
     def _get_cache_key(self, key: str) -> str:
         """生成缓存键的哈希值"""
-        return hashlib.md5(key.encode('utf-8')).hexdigest()
+        return _hash_key(key)
     
     def _get_cache_path(self, cache_key: str) -> str:
         """获取缓存文件路径"""
         return os.path.join(self.cache_dir, f'{cache_key}.cache')
     
-    def _is_expired(self, timestamp: float) -> bool:
-        """检查缓存是否过期"""
-        return time.time() - timestamp > self.ttl_hours * 3600
+    def _write_file(self, cache_path: str, timestamp: float, body: bytes):
+        """先写临时文件再原子替换，避免中途失败留下不完整的缓存文件"""
+        tmp_path = f'{cache_path}.tmp.{os.getpid()}.{threading.get_ident()}'
+        try:
+            with open(tmp_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                _dump(timestamp, body, f)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    def _remember(self, key: str, cache_data: Dict[str, Any]):
+        """放入内存缓存并按上限淘汰最久未用的条目"""
+        memory_cache = self.memory_cache
+        with self._memory_lock:
+            memory_cache[key] = cache_data
+            memory_cache.move_to_end(key)
+            while len(memory_cache) > self.memory_max_items:
+                memory_cache.popitem(last=False)
+    
+    def _is_expired(self, timestamp: float, now: Optional[float] = None) -> bool:
+        """检查缓存是否过期（批量检查时由调用方传入同一个当前时间）"""
+        if now is None:
+            now = time.time()
+        return now - timestamp > self._ttl_seconds
     
     def _cleanup_expired(self):
         """清理过期的缓存文件"""
-        if not os.path.exists(self.cache_dir):
-            return
+        ttl = self._ttl_seconds
+        # 文件修改时间即写入时间；只有接近过期边界的文件才读取文件头核对时间戳
+        margin = ttl * 0.01
+        now = time.time()
+        known_keys = self._known_keys
         
         try:
-            for filename in os.listdir(self.cache_dir):
-                if filename.endswith('.cache'):
-                    file_path = os.path.join(self.cache_dir, filename)
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith('.cache'):
+                        continue
                     try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            cache_data = json.load(f)
-                        
-                        if self._is_expired(cache_data.get('timestamp', 0)):
-                            os.remove(file_path)
-                            logger.debug(f"删除过期缓存文件: {filename}")
+                        age = now - entry.stat().st_mtime
+                        if age < ttl - margin:
+                            known_keys.add(entry.name[:-6])
+                            continue
+                        if age > ttl + margin or now - _read_timestamp(entry.path) > ttl:
+                            os.unlink(entry.path)
+                            logger.debug("删除过期缓存文件: %s", entry.name)
+                        else:
+                            known_keys.add(entry.name[:-6])
                     except Exception as e:
-                        logger.warning(f"清理缓存文件失败 {filename}: {e}")
+                        logger.warning("清理缓存文件失败 %s: %s", entry.name, e)
                         # 删除损坏的缓存文件
                         try:
-                            os.remove(file_path)
-                        except:
+                            os.unlink(entry.path)
+                        except OSError:
                             pass
+        except FileNotFoundError:
+            # 目录不存在即没有缓存文件
+            self._known_keys_complete = True
+            return
         except Exception as e:
-            logger.error(f"清理缓存目录失败: {e}")
+            logger.error("清理缓存目录失败: %s", e)
+            return
+        self._known_keys_complete = True
     
     def set(self, key: str, value: Any, memory_only: bool = False) -> bool:
         """设置缓存"""
         if not self.enabled:
             return False
         
-        cache_key = self._get_cache_key(key)
         cache_data = {
             'key': key,
             'value': value,
             'timestamp': time.time()
         }
         
-        # 内存缓存
-        self.memory_cache[cache_key] = cache_data
+        # 内存缓存直接以原始键索引，不需要哈希
+        self._remember(key, cache_data)
         
         # 文件缓存
         if not memory_only:
+            # 文件缓存只保存JSON，读取时不反序列化任意对象
+            body = _dumps_json({'key': key, 'value': value})
+            if body is None:
+                logger.warning("缓存值无法用JSON表示，只保存在内存: %s", key)
+                return False
+            self._disk_usage = None
             try:
+                # 文件名哈希随条目保存，删除时不再重新计算
+                cache_key = cache_data['file_key'] = self._get_cache_key(key)
                 cache_path = self._get_cache_path(cache_key)
-                with open(cache_path, 'w', encoding='utf-8') as f:
-                    json.dump(cache_data, f, ensure_ascii=False, indent=2)
-                logger.debug(f"缓存已保存: {key}")
+                self._write_file(cache_path, cache_data['timestamp'], body)
+                self._known_keys.add(cache_key)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("缓存已保存: %s", key)
                 return True
             except Exception as e:
-                logger.error(f"保存缓存失败 {key}: {e}")
+                logger.error("保存缓存失败 %s: %s", key, e)
                 return False
         
         return True
@@ -100,103 +236,135 @@ class Cache:
         if not self.enabled:
             return None
         
-        cache_key = self._get_cache_key(key)
-        
         # 先检查内存缓存
-        if cache_key in self.memory_cache:
-            cache_data = self.memory_cache[cache_key]
+        with self._memory_lock:
+            cache_data = self.memory_cache.get(key)
+            if cache_data is not None:
+                if self._is_expired(cache_data['timestamp']):
+                    # 清理过期的内存缓存
+                    del self.memory_cache[key]
+                    cache_data = None
+                else:
+                    self.memory_cache.move_to_end(key)
+        if cache_data is not None:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("从内存缓存获取: %s", key)
+            return cache_data['value']
+        
+        # 检查文件缓存（目录扫描完整时，不在已知文件中的键直接视为未命中）
+        cache_key = self._get_cache_key(key)
+        if self._known_keys_complete and cache_key not in self._known_keys:
+            return None
+        cache_path = self._get_cache_path(cache_key)
+        self._known_keys.discard(cache_key)
+        try:
+            cache_data = _load_file(cache_path)
+            
             if not self._is_expired(cache_data['timestamp']):
-                logger.debug(f"从内存缓存获取: {key}")
+                # 重新加载到内存缓存
+                self._known_keys.add(cache_key)
+                cache_data['file_key'] = cache_key
+                self._remember(key, cache_data)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("从文件缓存获取: %s", key)
                 return cache_data['value']
             else:
-                # 清理过期的内存缓存
-                del self.memory_cache[cache_key]
-        
-        # 检查文件缓存
-        cache_path = self._get_cache_path(cache_key)
-        if os.path.exists(cache_path):
+                # 删除过期的文件缓存
+                self._disk_usage = None
+                os.unlink(cache_path)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("删除过期缓存: %s", key)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("读取缓存失败 %s: %s", key, e)
+            # 删除损坏的缓存文件
+            self._disk_usage = None
             try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                
-                if not self._is_expired(cache_data['timestamp']):
-                    # 重新加载到内存缓存
-                    self.memory_cache[cache_key] = cache_data
-                    logger.debug(f"从文件缓存获取: {key}")
-                    return cache_data['value']
-                else:
-                    # 删除过期的文件缓存
-                    os.remove(cache_path)
-                    logger.debug(f"删除过期缓存: {key}")
-            except Exception as e:
-                logger.warning(f"读取缓存失败 {key}: {e}")
-                # 删除损坏的缓存文件
-                try:
-                    os.remove(cache_path)
-                except:
-                    pass
+                os.unlink(cache_path)
+            except OSError:
+                pass
         
         return None
     
     def delete(self, key: str) -> bool:
         """删除缓存"""
-        cache_key = self._get_cache_key(key)
-        
         # 删除内存缓存
-        if cache_key in self.memory_cache:
-            del self.memory_cache[cache_key]
+        with self._memory_lock:
+            cache_data = self.memory_cache.pop(key, None)
         
         # 删除文件缓存
+        cache_key = cache_data.get('file_key') if cache_data else None
+        if cache_key is None:
+            cache_key = self._get_cache_key(key)
+        self._known_keys.discard(cache_key)
         cache_path = self._get_cache_path(cache_key)
-        if os.path.exists(cache_path):
-            try:
-                os.remove(cache_path)
-                logger.debug(f"缓存已删除: {key}")
-                return True
-            except Exception as e:
-                logger.error(f"删除缓存失败 {key}: {e}")
-                return False
+        try:
+            os.unlink(cache_path)
+        except FileNotFoundError:
+            return True
+        except Exception as e:
+            logger.error("删除缓存失败 %s: %s", key, e)
+            return False
         
+        self._disk_usage = None
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("缓存已删除: %s", key)
         return True
     
     def clear(self) -> bool:
         """清空所有缓存"""
         try:
             # 清空内存缓存
-            self.memory_cache.clear()
+            with self._memory_lock:
+                self.memory_cache.clear()
             
-            # 清空文件缓存
-            if os.path.exists(self.cache_dir):
-                for filename in os.listdir(self.cache_dir):
-                    if filename.endswith('.cache'):
-                        os.remove(os.path.join(self.cache_dir, filename))
+            # 清空文件缓存，多个文件并发删除
+            self._disk_usage = None
+            self._known_keys.clear()
+            # 删除完成前磁盘上可能仍有文件，先回退到检查磁盘
+            self._known_keys_complete = False
+            try:
+                with os.scandir(self.cache_dir) as it:
+                    paths = [entry.path for entry in it if entry.name.endswith('.cache')]
+            except FileNotFoundError:
+                paths = []
+            if paths:
+                with ThreadPoolExecutor(max_workers=min(_REMOVE_WORKERS, len(paths))) as executor:
+                    for _ in executor.map(os.unlink, paths):
+                        pass
+            self._known_keys_complete = True
             
             logger.info("所有缓存已清空")
             return True
         except Exception as e:
-            logger.error(f"清空缓存失败: {e}")
+            logger.error("清空缓存失败: %s", e)
             return False
     
     def get_cache_size(self) -> Dict[str, float]:
         """获取缓存大小信息（MB）"""
         try:
-            total_size = 0
-            file_count = 0
-            
-            if os.path.exists(self.cache_dir):
-                for filename in os.listdir(self.cache_dir):
-                    if filename.endswith('.cache'):
-                        file_path = os.path.join(self.cache_dir, filename)
-                        total_size += os.path.getsize(file_path)
-                        file_count += 1
+            if self._disk_usage is None:
+                total_size = 0
+                file_count = 0
+                try:
+                    with os.scandir(self.cache_dir) as it:
+                        for entry in it:
+                            if entry.name.endswith('.cache'):
+                                total_size += entry.stat().st_size
+                                file_count += 1
+                except FileNotFoundError:
+                    pass
+                self._disk_usage = (total_size, file_count)
             
+            total_size, file_count = self._disk_usage
             return {
                 'total_size_mb': total_size / (1024 * 1024),
                 'file_count': file_count,
                 'memory_items': len(self.memory_cache)
             }
         except Exception as e:
-            logger.error(f"获取缓存大小失败: {e}")
+            logger.error("获取缓存大小失败: %s", e)
             return {'total_size_mb': 0, 'file_count': 0, 'memory_items': 0}
 
 # 全局缓存实例
@@ -7,12 +7,48 @@
 import os
 import shutil
 import hashlib
+import tempfile
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fnmatch import fnmatch
 from typing import List, Optional, Tuple
 from ..config import config
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# 计算文件哈希时每次读取的块大小
+_HASH_CHUNK_SIZE = 1 << 20
+
+# 文件哈希缓存：绝对路径 -> (修改时间ns, 大小, 哈希值)，文件变化后重新计算
+# 按最近使用顺序排列，超过上限时淘汰最久未用的条目
+_file_hash_cache: 'OrderedDict[str, Tuple[int, int, str]]' = OrderedDict()
+_FILE_HASH_CACHE_SIZE = 256
+
+# 文件名中不安全的字符统一替换为下划线
+_UNSAFE_CHARS = '<>:"/\\|?*'
+_SAFE_TRANS = str.maketrans({c: '_' for c in _UNSAFE_CHARS})
+
+# 支持的格式和文件大小上限在模块加载时读取一次，配置变化后调用FileUtils.refresh_formats
+_AUDIO_EXTS = frozenset()
+_VIDEO_EXTS = frozenset()
+_EXT_TUPLE = ()
+_MAX_FILE_SIZE_MB = 100
+
+# 清理临时文件时并发删除的线程数
+_REMOVE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+def _remove_entry(entry: os.DirEntry) -> bool:
+    """删除一个文件或目录，返回是否删除了内容"""
+    if entry.is_dir(follow_symlinks=False):
+        shutil.rmtree(entry.path)
+        return True
+    if entry.is_file():
+        os.remove(entry.path)
+        return True
+    return False
+
 class FileUtils:
     """文件工具类"""
     
@@ -27,20 +63,31 @@ class FileUtils:
         try:
             return os.path.getsize(file_path) / (1024 * 1024)
         except Exception as e:
-            logger.error(f"获取文件大小失败 {file_path}: {e}")
+            logger.error("获取文件大小失败 %s: %s", file_path, e)
             return 0.0
     
+    @classmethod
+    def refresh_formats(cls):
+        """重新读取支持的格式和文件大小上限"""
+        global _AUDIO_EXTS, _VIDEO_EXTS, _EXT_TUPLE, _MAX_FILE_SIZE_MB
+        _AUDIO_EXTS = frozenset(ext.lower() for ext in config.get('supported_formats.audio', []))
+        _VIDEO_EXTS = frozenset(ext.lower() for ext in config.get('supported_formats.video', []))
+        _EXT_TUPLE = tuple(_AUDIO_EXTS | _VIDEO_EXTS)
+        _MAX_FILE_SIZE_MB = config.get('transcribe.max_file_size_mb', 100)
+    
+    @staticmethod
+    def supported_extensions() -> Tuple[str, ...]:
+        """获取支持的扩展名元组（小写），可直接用于str.endswith"""
+        return _EXT_TUPLE
+    
     @staticmethod
     def is_supported_format(file_path: str) -> Tuple[bool, str]:
         """检查文件格式是否支持"""
         ext = FileUtils.get_file_extension(file_path)
         
-        audio_formats = config.get('supported_formats.audio', [])
-        video_formats = config.get('supported_formats.video', [])
-        
-        if ext in audio_formats:
+        if ext in _AUDIO_EXTS:
             return True, 'audio'
-        elif ext in video_formats:
+        elif ext in _VIDEO_EXTS:
             return True, 'video'
         else:
             return False, 'unknown'
@@ -48,42 +95,73 @@ class FileUtils:
     @staticmethod
     def validate_file(file_path: str) -> Tuple[bool, str]:
         """验证文件是否有效"""
+        is_valid, message, _, _ = FileUtils.validate_file_details(file_path)
+        return is_valid, message
+    
+    @staticmethod
+    def validate_file_details(file_path: str) -> Tuple[bool, str, str, float]:
+        """验证文件是否有效，同时返回文件类型和大小（MB），避免调用方重复检查"""
         if not file_path:
-            return False, "文件路径为空"
+            return False, "文件路径为空", 'unknown', 0.0
         
         if not os.path.exists(file_path):
-            return False, "文件不存在"
+            return False, "文件不存在", 'unknown', 0.0
         
         if not os.path.isfile(file_path):
-            return False, "路径不是文件"
+            return False, "路径不是文件", 'unknown', 0.0
         
         # 检查文件格式
         is_supported, file_type = FileUtils.is_supported_format(file_path)
         if not is_supported:
             ext = FileUtils.get_file_extension(file_path)
-            return False, f"不支持的文件格式: {ext}"
+            return False, f"不支持的文件格式: {ext}", file_type, 0.0
         
         # 检查文件大小
         file_size_mb = FileUtils.get_file_size_mb(file_path)
-        max_size_mb = config.get('transcribe.max_file_size_mb', 100)
+        max_size_mb = _MAX_FILE_SIZE_MB
         if file_size_mb > max_size_mb:
-            return False, f"文件太大: {file_size_mb:.1f}MB (最大: {max_size_mb}MB)"
+            return False, f"文件太大: {file_size_mb:.1f}MB (最大: {max_size_mb}MB)", file_type, file_size_mb
         
-        return True, f"有效的{file_type}文件"
+        return True, f"有效的{file_type}文件", file_type, file_size_mb
     
     @staticmethod
     def get_file_hash(file_path: str) -> Optional[str]:
-        """获取文件MD5哈希值"""
+        """获取文件哈希值（BLAKE2b，32位十六进制），文件未变化时返回缓存结果"""
         try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+            path = os.path.abspath(file_path)
+            st = os.stat(path)
+            cached = _file_hash_cache.get(path)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                _file_hash_cache.move_to_end(path)
+                return cached[2]
+            
+            file_hash = hashlib.blake2b(digest_size=16)
+            # 复用同一块缓冲区读取，避免每块重新分配
+            buffer = bytearray(_HASH_CHUNK_SIZE)
+            view = memoryview(buffer)
+            with open(file_path, "rb", buffering=0) as f:
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                while True:
+                    n = f.readinto(buffer)
+                    if not n:
+                        break
+                    file_hash.update(view[:n])
+            digest = file_hash.hexdigest()
+            _file_hash_cache[path] = (st.st_mtime_ns, st.st_size, digest)
+            _file_hash_cache.move_to_end(path)
+            while len(_file_hash_cache) > _FILE_HASH_CACHE_SIZE:
+                _file_hash_cache.popitem(last=False)
+            return digest
         except Exception as e:
-            logger.error(f"计算文件哈希失败 {file_path}: {e}")
+            logger.error("计算文件哈希失败 %s: %s", file_path, e)
             return None
     
+    @staticmethod
+    def clear_hash_cache():
+        """清空文件哈希缓存"""
+        _file_hash_cache.clear()
+    
     @staticmethod
     def ensure_directory(directory: str) -> bool:
         """确保目录存在"""
@@ -91,23 +169,26 @@ class FileUtils:
             os.makedirs(directory, exist_ok=True)
             return True
         except Exception as e:
-            logger.error(f"创建目录失败 {directory}: {e}")
+            logger.error("创建目录失败 %s: %s", directory, e)
             return False
     
     @staticmethod
-    def copy_file(src: str, dst: str, create_dirs: bool = True) -> bool:
-        """复制文件"""
+    def copy_file(src: str, dst: str, create_dirs: bool = True, preserve_metadata: bool = False) -> bool:
+        """复制文件（使用系统提供的内核复制，需要时再复制元数据）"""
         try:
             if create_dirs:
                 dst_dir = os.path.dirname(dst)
                 if not FileUtils.ensure_directory(dst_dir):
                     return False
             
-            shutil.copy2(src, dst)
-            logger.debug(f"文件已复制: {src} -> {dst}")
+            # copyfile会使用fcopyfile/sendfile等系统复制接口
+            shutil.copyfile(src, dst)
+            if preserve_metadata:
+                shutil.copystat(src, dst)
+            logger.debug("文件已复制: %s -> %s", src, dst)
             return True
         except Exception as e:
-            logger.error(f"复制文件失败 {src} -> {dst}: {e}")
+            logger.error("复制文件失败 %s -> %s: %s", src, dst, e)
             return False
     
     @staticmethod
@@ -119,31 +200,30 @@ class FileUtils:
                 if not FileUtils.ensure_directory(dst_dir):
                     return False
             
-            shutil.move(src, dst)
-            logger.debug(f"文件已移动: {src} -> {dst}")
+            # 同一文件系统内直接重命名；跨文件系统时用快速复制后删除源文件
+            shutil.move(src, dst, copy_function=shutil.copyfile)
+            logger.debug("文件已移动: %s -> %s", src, dst)
             return True
         except Exception as e:
-            logger.error(f"移动文件失败 {src} -> {dst}: {e}")
+            logger.error("移动文件失败 %s -> %s: %s", src, dst, e)
             return False
     
     @staticmethod
     def delete_file(file_path: str) -> bool:
         """删除文件"""
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                logger.debug(f"文件已删除: {file_path}")
+            os.unlink(file_path)
+            logger.debug("文件已删除: %s", file_path)
+            return True
+        except FileNotFoundError:
             return True
         except Exception as e:
-            logger.error(f"删除文件失败 {file_path}: {e}")
+            logger.error("删除文件失败 %s: %s", file_path, e)
             return False
     
     @staticmethod
     def get_temp_file_path(prefix: str = 'ai_transcribe', suffix: str = '') -> str:
         """获取临时文件路径"""
-        import tempfile
-        import uuid
-        
         temp_dir = tempfile.gettempdir()
         filename = f"{prefix}_{uuid.uuid4().hex[:8]}{suffix}"
         return os.path.join(temp_dir, filename)
@@ -151,40 +231,42 @@ class FileUtils:
     @staticmethod
     def cleanup_temp_files(pattern: str = 'ai_transcribe*') -> int:
         """清理临时文件"""
-        import tempfile
-        import glob
-        
         temp_dir = tempfile.gettempdir()
-        pattern_path = os.path.join(temp_dir, pattern)
-        temp_files = glob.glob(pattern_path)
+        try:
+            with os.scandir(temp_dir) as it:
+                entries = [entry for entry in it if fnmatch(entry.name, pattern)]
+        except OSError as e:
+            logger.warning("读取临时目录失败 %s: %s", temp_dir, e)
+            return 0
         
         cleaned_count = 0
-        for temp_file in temp_files:
-            try:
-                if os.path.isfile(temp_file):
-                    os.remove(temp_file)
-                    cleaned_count += 1
-                elif os.path.isdir(temp_file):
-                    shutil.rmtree(temp_file)
-                    cleaned_count += 1
-            except Exception as e:
-                logger.warning(f"清理临时文件失败 {temp_file}: {e}")
+        if entries:
+            # 文件较多时逐个删除主要耗在系统调用等待上，交给线程池并发处理
+            with ThreadPoolExecutor(max_workers=min(_REMOVE_WORKERS, len(entries))) as executor:
+                futures = {executor.submit(_remove_entry, entry): entry for entry in entries}
+                for future in as_completed(futures):
+                    try:
+                        if future.result():
+                            cleaned_count += 1
+                    except Exception as e:
+                        logger.warning("清理临时文件失败 %s: %s", futures[future].path, e)
         
         if cleaned_count > 0:
-            logger.info(f"已清理 {cleaned_count} 个临时文件")
+            logger.info("已清理 %s 个临时文件", cleaned_count)
         
         return cleaned_count
     
     @staticmethod
     def get_safe_filename(filename: str) -> str:
         """获取安全的文件名（移除特殊字符）"""
-        import re
-        
-        # 移除或替换不安全的字符
-        safe_filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+        # 替换不安全的字符
+        safe_filename = filename.translate(_SAFE_TRANS)
         # 限制长度
         if len(safe_filename) > 200:
             name, ext = os.path.splitext(safe_filename)
             safe_filename = name[:200-len(ext)] + ext
         
-        return safe_filename
\ No newline at end of file
+        return safe_filename
+
+# 读取支持的格式配置
+FileUtils.refresh_formats()
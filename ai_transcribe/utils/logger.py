@@ -4,10 +4,52 @@
 提供完整的日志记录和错误追踪功能
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 from datetime import datetime
-from typing import Optional
+from typing import Dict
+
+# 日志目录和日期后缀在模块加载时确定一次
+_LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
+_LOG_DATE = datetime.now().strftime("%Y%m%d")
+
+# 所有日志器共用一个队列，由后台线程写文件和控制台，调用方不等待磁盘IO
+_log_queue = queue.SimpleQueue()
+_listener = None
+_listener_lock = threading.Lock()
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """把日志记录连同它的目标处理器一起放入共享队列"""
+    
+    def __init__(self, targets):
+        super().__init__(_log_queue)
+        self.targets = targets
+    
+    def enqueue(self, record):
+        self.queue.put_nowait((self.targets, record))
+
+class _QueueListener(logging.handlers.QueueListener):
+    """后台线程：把队列中的记录交给各自的目标处理器"""
+    
+    def handle(self, item):
+        targets, record = item
+        for handler in targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+def _ensure_listener():
+    """首次使用时启动后台日志线程"""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = _QueueListener(_log_queue)
+            _listener.start()
+            # 退出时停止线程，写完队列中剩余的日志
+            atexit.register(_listener.stop)
 
 class Logger:
     """日志管理器"""
@@ -17,19 +59,21 @@ class Logger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level)
         
-        # 避免重复添加handler
-        if not self.logger.handlers:
+        # 避免重复添加handler（包括父级日志器上已有的）
+        if not self.logger.hasHandlers():
             self._setup_handlers()
     
     def _setup_handlers(self):
         """设置日志处理器"""
         # 创建日志目录
-        log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
-        os.makedirs(log_dir, exist_ok=True)
+        try:
+            os.makedirs(_LOG_DIR)
+        except FileExistsError:
+            pass
         
         # 文件处理器
-        log_file = os.path.join(log_dir, f'{self.name}_{datetime.now().strftime("%Y%m%d")}.log')
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        log_file = os.path.join(_LOG_DIR, f'{self.name}_{_LOG_DATE}.log')
+        file_handler = logging.FileHandler(log_file, encoding='utf-8', delay=True)
         file_handler.setLevel(logging.DEBUG)
         
         # 控制台处理器
@@ -45,8 +89,12 @@ class Logger:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
         
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        _ensure_listener()
+        self.logger.addHandler(_QueueHandler((file_handler, console_handler)))
+    
+    def isEnabledFor(self, level: int) -> bool:
+        """检查指定级别的日志是否会被记录"""
+        return self.logger.isEnabledFor(level)
     
     def debug(self, message: str, *args, **kwargs):
         """调试日志"""
@@ -72,12 +120,12 @@ class Logger:
         """异常日志（会记录堆栈跟踪）"""
         self.logger.exception(message, *args, **kwargs)
 
-# 全局日志实例
-_global_logger: Optional[Logger] = None
+# 按名称缓存的日志器实例
+_loggers: Dict[str, Logger] = {}
 
 def get_logger(name: str = 'ai_transcribe', level: int = logging.INFO) -> Logger:
     """获取日志器实例"""
-    global _global_logger
-    if _global_logger is None or _global_logger.name != name:
-        _global_logger = Logger(name, level)
-    return _global_logger
\ No newline at end of file
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = Logger(name, level)
+    return logger